@@ -1,29 +1,208 @@
-from typing import Dict, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
 import json
+import logging
+import time
 import pygame as pg
 import os
 
+from assets.images.glyph_atlas import GlyphAtlas
+from assets.source.text_layout import GlyphMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class AssetRegistry:
+    """
+    loads every image and sprite sheet index once and shares them between all SpriteSheet instances
+
+    Sources are converted once per file. Glyphs cut from them are kept in one table per (sheet, scale), which
+    every SpriteSheet of that sheet and scale reads directly, so a cached glyph costs a single dict lookup. The
+    tables together hold at most ``max_glyph_bytes`` of pixel data, beyond that the glyphs cut longest ago are
+    dropped from them first, a dropped glyph still in use is cut again on its next lookup. Glyphs baked into the ``atlas`` file (see glyph_atlas) are
+    taken from it without rescaling. The atlas is baked offline by ``python -m assets.images.glyph_atlas`` and
+    checked in, a missing or stale atlas falls back to cutting glyphs from the source in memory.
+
+    .. code-block:: python3
+
+        font = registry.sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 4)
+    """
+
+    def __init__(self, max_glyph_bytes: int = 4 * 1024 * 1024, atlas: Optional[str] = "alphabet.atlas"):
+        self.atlas_name = atlas
+        self._atlas: Optional[GlyphAtlas] = ...
+        self.images: Dict[str, pg.Surface] = {}
+        self.converted: Dict[str, pg.Surface] = {}
+        self.infos: Dict[str, Dict[str, Tuple[int, int, int, int]]] = {}
+        self.infos_by_sheet: Dict[str, str] = {}
+        self.fresh_sheets: Dict[str, bool] = {}
+        self.tables: Dict[Tuple[str, float], Dict[str, pg.Surface]] = {}
+        # bytes of every cached glyph by (sheet, glyph, scale), oldest first
+        self.glyphs: "OrderedDict[Tuple[str, str, float], int]" = OrderedDict()
+        self.max_glyph_bytes = max_glyph_bytes
+        self.glyph_bytes = 0
+        self.misses = 0
+
+    def image(self, name: str) -> pg.Surface:
+        if name not in self.images:
+            self.images[name] = load_image(name)
+        return self.images[name]
+
+    def converted_image(self, name: str) -> pg.Surface:
+        if name not in self.converted:
+            self.converted[name] = self.image(name).convert_alpha()
+        return self.converted[name]
+
+    def info(self, name: str) -> Dict[str, Tuple[int, int, int, int]]:
+        if name not in self.infos:
+            with open(get_path(name)) as file:
+                self.infos[name] = json.load(file)
+        return self.infos[name]
+
+    @property
+    def atlas(self) -> Optional[GlyphAtlas]:
+        if self._atlas is ...:
+            self._atlas = self.load_atlas()
+        return self._atlas
+
+    def load_atlas(self) -> Optional[GlyphAtlas]:
+        if not self.atlas_name or not os.path.exists(get_path(self.atlas_name)):
+            return None
+        start = time.perf_counter()
+        try:
+            atlas = GlyphAtlas(get_path(self.atlas_name))
+        except (OSError, ValueError) as error:
+            logger.warning(f"can't load glyph atlas {self.atlas_name} ({error}), cutting glyphs from sheets")
+            return None
+        timings = ", ".join(f"{phase} {seconds * 1000:.2f}ms" for phase, seconds in atlas.timings.items())
+        logger.info(f"loaded glyph atlas {self.atlas_name} in {(time.perf_counter() - start) * 1000:.2f}ms ({timings})")
+        return atlas
+
+    def atlas_for(self, sheet: str) -> Optional[GlyphAtlas]:
+        if sheet not in self.fresh_sheets:
+            atlas = self.atlas
+            self.fresh_sheets[sheet] = atlas is not None and atlas.matches(get_path(sheet),
+                                                                           get_path(self.infos_by_sheet[sheet]))
+            if atlas is not None and not self.fresh_sheets[sheet]:
+                logger.warning(f"glyph atlas {self.atlas_name} is stale for {sheet}, cutting glyphs from the sheet, "
+                               f"rebake it with python -m assets.images.glyph_atlas")
+        return self.atlas if self.fresh_sheets[sheet] else None
+
+    def sprite_sheet(self, sheet: str, info: str, default: str, scale: float = 1) -> "SpriteSheet":
+        self.infos_by_sheet[sheet] = info
+        return SpriteSheet(self.image(sheet), self.info(info), default, scale, self, sheet)
+
+    def table(self, sheet: str, scale: float) -> Dict[str, pg.Surface]:
+        """
+        glyphs of ``sheet`` at ``scale`` cached so far, filled by ``glyph``
+        """
+        table = self.tables.get((sheet, scale))
+        if table is None:
+            table = self.tables[sheet, scale] = {}
+        return table
+
+    def glyph(self, sheet: str, name: str, scale: float, build: Callable[[str], pg.Surface]) -> pg.Surface:
+        """
+        takes a glyph that isn't in its table yet from the atlas, or ``build`` when the atlas doesn't have it
+        """
+        self.misses += 1
+        atlas = self.atlas_for(sheet)
+        glyph = atlas.get(sheet, name, scale) if atlas is not None else None
+        if glyph is None:
+            glyph = build(name)
+        self.table(sheet, scale)[name] = glyph
+        size = self.glyphs[sheet, name, scale] = self.surface_bytes(glyph)
+        self.glyph_bytes += size
+        while self.glyph_bytes > self.max_glyph_bytes and len(self.glyphs) > 1:
+            (evicted_sheet, evicted, evicted_scale), size = self.glyphs.popitem(last=False)
+            del self.tables[evicted_sheet, evicted_scale][evicted]
+            self.glyph_bytes -= size
+        return glyph
+
+    @staticmethod
+    def surface_bytes(surface: pg.Surface) -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.images.clear()
+        self.converted.clear()
+        self.infos.clear()
+        # sheets keep reading their tables, empty them instead of dropping them
+        for table in self.tables.values():
+            table.clear()
+        self.glyphs.clear()
+        self.glyph_bytes = 0
+        self.fresh_sheets.clear()
+        self._atlas = ...
+
 
 class SpriteSheet:
-    def __init__(self, source: pg.Surface, info: Dict[str, Tuple[int, int, int, int]], default: str, scale: float = 1):
+    """
+    glyphs cut from a source image on first use, names the sheet doesn't have resolve to ``default``
+
+    Unknown names are collected in ``missing`` and get the default glyph. Every lookup counts once:
+    in ``hits`` when the glyph was already cached, in ``misses`` when it wasn't. ``generations`` counts glyphs cut
+    and scaled, misses served from the glyph atlas don't cut any.
+    """
+
+    def __init__(self, source: pg.Surface, info: Dict[str, Tuple[int, int, int, int]], default: str, scale: float = 1,
+                 registry: Optional[AssetRegistry] = None, name: Optional[str] = None):
         self.source = source
         self.info = info
-        self.images: Dict[str, pg.Surface] = dict()
         self.default = default
         self.scale = scale
         self.generated = False
+        self.missing: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        self.generations = 0
+        self._metrics: Optional[GlyphMetrics] = None
+        # glyphs of sheets loaded through a registry are shared with every sheet cut from the same file
+        self.registry = registry if name is not None else None
+        self.name = name
+        self.images: Dict[str, pg.Surface] = self.registry.table(name, scale) if self.registry else dict()
+
+    @property
+    def metrics(self) -> GlyphMetrics:
+        """
+        glyph sizes at the sheet's scale, for laying out text without cutting glyphs
+        """
+        if self._metrics is None:
+            self._metrics = GlyphMetrics(self.info, self.default, self.scale)
+        return self._metrics
 
     def generate(self):
-        if not self.generated:
+        """
+        converts the source for blitting, glyphs themselves are cut when first asked for
+        """
+        if self.generated:
+            return
+        if self.registry:
+            self.source = self.registry.converted_image(self.name)
+        else:
             self.source = self.source.convert_alpha()
-        for image in self.info:
-            self.images[image] = self.get_subsurface(image)
         self.generated = True
 
-    def get(self, name: str):
-        if name not in self.images:
+    def get(self, name: str) -> pg.Surface:
+        glyph = self.images.get(name)
+        if glyph is not None:
+            self.hits += 1
+            return glyph
+        if name not in self.info:
+            # counted as a lookup of the default glyph
+            self.missing.add(name)
+            return self.get(self.default)
+        self.misses += 1
+        if not self.generated:
             self.generate()
-        return self.images[name] if name in self.images else self.images[self.default]
+        if self.registry:
+            return self.registry.glyph(self.name, name, self.scale, self.build)
+        glyph = self.images[name] = self.build(name)
+        return glyph
+
+    def build(self, name: str) -> pg.Surface:
+        self.generations += 1
+        return self.get_subsurface(name)
 
     def get_subsurface(self, name: str) -> pg.Surface:
         cords = self.info[name]
@@ -35,7 +214,7 @@ class SpriteSheet:
 
 
 def load_sprite_sheet(sheet: str, info: str, default: str, scale: float = 1):
-    return SpriteSheet(load_image(sheet), json.load(open(get_path(info))), default, scale)
+    return registry.sprite_sheet(sheet, info, default, scale)
 
 
 def load_image(name: str):
@@ -44,3 +223,7 @@ def load_image(name: str):
 
 def get_path(name: str):
     return os.path.join(os.path.abspath(""), "assets", "images", name)
+
+
+# default registry, shared by every load_sprite_sheet call
+registry = AssetRegistry()
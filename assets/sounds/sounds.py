@@ -1,10 +1,126 @@
-import pygame as pg
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import logging
 import os
+import pygame as pg
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# short effects, loaded from <name>.wav next to this file when it exists, otherwise synthesized as a square wave
+# blip of (frequency Hz, length ms)
+EFFECTS: Dict[str, Tuple[float, int]] = {"paddle": (460., 60), "wall": (230., 50), "score": (120., 250),
+                                         "bullet": (920., 40)}
+
+
+def play_music(song: str, loops: int = -1) -> bool:
+    """
+    streams ``song`` through pg.mixer.music, decoded a chunk at a time by SDL instead of held in memory,
+    False when there's no mixer or the file can't be opened
+    """
+    if not pg.mixer.get_init():
+        return False
+    try:
+        pg.mixer.music.load(get_path(song))
+    except (pg.error, FileNotFoundError) as error:
+        logger.warning(f"can't stream {song} ({error}), playing without music")
+        return False
+    pg.mixer.music.play(loops)
+    return True
+
+
+def blip(frequency: float, ms: int, volume: float = 0.3) -> pg.mixer.Sound:
+    """
+    square wave with a linear fade out, in the mixer's sample format
+    """
+    rate, _, channels = pg.mixer.get_init()
+    samples = int(rate * ms / 1000)
+    times = np.arange(samples) / rate
+    wave = np.where(np.sin(2 * np.pi * frequency * times) >= 0, volume, -volume) * np.linspace(1, 0, samples)
+    dtype = pg.sndarray.samples(pg.mixer.Sound(buffer=bytes(64))).dtype
+    if dtype.kind == "f":
+        data = wave.astype(dtype)
+    elif dtype.kind == "u":
+        data = ((wave + 1) / 2 * np.iinfo(dtype).max).astype(dtype)
+    else:
+        data = (wave * np.iinfo(dtype).max).astype(dtype)
+    if channels > 1:
+        data = np.repeat(data[:, None], channels, axis=1)
+    return pg.sndarray.make_sound(np.ascontiguousarray(data))
+
 
+class SoundMixer:
+    """
+    preloaded sound effects played on a fixed pool of reserved channels
 
-def get_song(song: str):
-    return pg.mixer.Sound(get_path(song))
+    ``init`` loads every effect once, after that ``play`` only picks a channel: an idle one, or the one that started
+    longest ago when all of them are busy (voice stealing). Without an initialized pg.mixer (headless simulations,
+    servers) ``play`` does nothing, same while ``muted``.
+
+    .. code-block:: python3
+
+        mixer.init()
+        mixer.play("paddle")
+        with mixer.muted():
+            game.update()  # ticks simulated again stay silent
+    """
+
+    def __init__(self, channels: int = 8, effects: Optional[Dict[str, Tuple[float, int]]] = None):
+        self.size = channels
+        self.effect_specs = EFFECTS if effects is None else effects
+        self.effects: Dict[str, pg.mixer.Sound] = {}
+        self.channels: List[pg.mixer.Channel] = []
+        # play number each channel was last started at, the smallest is stolen first
+        self.started: List[int] = []
+        self.enabled = False
+        self.mute = 0
+        self.played = 0
+        self.stolen = 0
+
+    def init(self):
+        if self.enabled or not pg.mixer.get_init():
+            return
+        for name, (frequency, ms) in self.effect_specs.items():
+            path = get_path(name + ".wav")
+            self.effects[name] = pg.mixer.Sound(path) if os.path.exists(path) else blip(frequency, ms)
+        if pg.mixer.get_num_channels() < self.size:
+            pg.mixer.set_num_channels(self.size)
+        # Sound.play picks free channels on its own, reserved ones are left to the pool
+        pg.mixer.set_reserved(self.size)
+        self.channels = [pg.mixer.Channel(index) for index in range(self.size)]
+        self.started = [0] * self.size
+        self.enabled = True
+
+    def play(self, name: str):
+        if not self.enabled or self.mute:
+            return
+        sound = self.effects[name]
+        self.played += 1
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                break
+        else:
+            index = self.started.index(min(self.started))
+            self.stolen += 1
+        self.channels[index].play(sound)
+        self.started[index] = self.played
+
+    @contextmanager
+    def muted(self):
+        self.mute += 1
+        try:
+            yield
+        finally:
+            self.mute -= 1
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
 
 
 def get_path(name: str):
     return os.path.join(os.path.abspath(""), "assets", "sounds", name)
+
+
+# default mixer, shared by every scene, silent until App initializes it
+mixer = SoundMixer()
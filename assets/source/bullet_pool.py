@@ -0,0 +1,97 @@
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pygame as p
+
+
+class BulletPool:
+    """
+    preallocated bullets moved, culled and hit tested as whole arrays
+
+    Every bullet is a ``size`` square with an integer top-left corner, a horizontal speed and a side, the index
+    of the target it can hit. Free slots are reused, the pool doubles when it runs out of them.
+
+    .. code-block:: python3
+
+        pool = BulletPool((5, 5))
+        pool.spawn(player.rect.center, 5, side=1)
+        hits = pool.update([player.hit_box, bot.hit_box], bounds)  # bullets that hit each side this tick
+    """
+
+    def __init__(self, size: Tuple[int, int], capacity: int = 64):
+        self.size = size
+        self.x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.speed = np.zeros(capacity, dtype=np.int64)
+        self.side = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def grow(self):
+        capacity = self.capacity
+        for name in ("x", "y", "speed", "side", "alive"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+        self.free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def spawn(self, center: Tuple[int, int], speed: int, side: int) -> int:
+        if not self.free:
+            self.grow()
+        index = self.free.pop()
+        # same corner as setting pg.Rect.center
+        self.x[index] = center[0] - self.size[0] // 2
+        self.y[index] = center[1] - self.size[1] // 2
+        self.speed[index] = speed
+        self.side[index] = side
+        self.alive[index] = True
+        return index
+
+    def kill(self, mask: np.ndarray):
+        self.alive &= ~mask
+        self.free.extend(np.flatnonzero(mask).tolist())
+
+    def hits(self, targets: Iterable[p.Rect]) -> np.ndarray:
+        w, h = self.size
+        hit = np.zeros(self.capacity, dtype=bool)
+        counts = []
+        for side, target in enumerate(targets):
+            mask = self.alive & (self.side == side) & (self.x < target.right) & (target.left < self.x + w) & \
+                (self.y < target.bottom) & (target.top < self.y + h)
+            counts.append(int(mask.sum()))
+            hit |= mask
+        self.kill(hit)
+        return np.array(counts, dtype=np.int64)
+
+    def update(self, targets: Iterable[p.Rect], bounds: p.Rect) -> np.ndarray:
+        """
+        hit tests bullets where they are, then moves the rest and drops those leaving ``bounds``
+
+        Returns
+        -------
+            np.ndarray
+                number of bullets that hit each target
+        """
+        counts = self.hits(targets)
+        self.x += np.where(self.alive, self.speed, 0)
+        w, h = self.size
+        outside = self.alive & ((self.x < bounds.left) | (self.y < bounds.top) | (self.x + w > bounds.right) |
+                                (self.y + h > bounds.bottom))
+        self.kill(outside)
+        return counts
+
+    def rects(self) -> List[p.Rect]:
+        w, h = self.size
+        return [p.Rect(x, y, w, h) for x, y in zip(self.x[self.alive].tolist(), self.y[self.alive].tolist())]
+
+    def clear(self):
+        self.kill(self.alive.copy())
+
+
+__all__ = ["BulletPool"]
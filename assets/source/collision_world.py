@@ -0,0 +1,189 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import pygame as p
+
+
+class Collider:
+    """
+    registration of one collidable object, ``rect`` is read through ``get_rect`` once per step
+    """
+    __slots__ = ("owner", "get_rect", "layer", "collides_with", "on_contact", "static", "order", "rect")
+
+    def __init__(self, owner: Any, get_rect: Callable[[], p.Rect], layer: str, collides_with: Iterable[str],
+                 on_contact: Optional[Callable[[Any], None]], static: bool, order: int):
+        self.owner = owner
+        self.get_rect = get_rect
+        self.layer = layer
+        self.collides_with = frozenset(collides_with)
+        self.on_contact = on_contact
+        self.static = static
+        self.order = order
+        self.rect: p.Rect = get_rect()
+
+
+class Layer:
+    """
+    colliders of one layer in registration order, their rects as of the last refresh and a lazily built grid
+    """
+    __slots__ = ("colliders", "rects", "grid", "scans")
+
+    def __init__(self):
+        self.colliders: List[Collider] = []
+        self.rects: List[p.Rect] = []
+        # cell -> indices into colliders, built the first time the layer is searched through a grid after a refresh
+        self.grid: Optional[Dict[Tuple[int, int], List[int]]] = None
+        # layers looked for by any collider of this layer
+        self.scans: Set[str] = set()
+
+    def __len__(self):
+        return len(self.colliders)
+
+
+class CollisionWorld:
+    """
+    per layer broadphase delivering contact callbacks between registered objects
+
+    Colliders are kept per layer, and only colliders with ``collides_with`` layers look for contacts, only in
+    those layers, so a step never walks colliders of layers nobody asked for. For each pair of layers the smaller
+    side is tested against the bigger one: against its rect list with ``Rect.collidelistall`` while the smaller
+    side has at most ``grid_threshold`` colliders (a few paddles against thousands of balls stays in C), otherwise
+    against a uniform grid of the bigger layer with ``cell_size`` cells.
+
+    Contacts are delivered in registration order: for every scanning collider its contacts in the order they
+    were added, and each contact calls ``on_contact`` of both sides with the other side's owner. Static colliders
+    are read once, dynamic ones are re-read every step.
+
+    .. code-block:: python3
+
+        world = CollisionWorld()
+        world.add(pad, lambda: pad.hit_box, "pad")
+        world.add(goal, lambda: goal.rect, "goal", on_contact=goal.on_contact, static=True)
+        world.add(ball, lambda: ball.hit_box, "ball", ("pad", "goal"), ball.on_contact)
+        world.step()
+    """
+
+    def __init__(self, cell_size: int = 64, grid_threshold: int = 128):
+        self.cell_size = cell_size
+        self.grid_threshold = grid_threshold
+        self.colliders: Dict[int, Collider] = {}
+        self.layers: Dict[str, Layer] = {}
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.colliders)
+
+    def add(self, owner: Any, get_rect: Callable[[], p.Rect], layer: str, collides_with: Iterable[str] = (),
+            on_contact: Optional[Callable[[Any], None]] = None, static: bool = False) -> Collider:
+        collider = Collider(owner, get_rect, layer, collides_with, on_contact, static, self.next_order)
+        self.next_order += 1
+        self.colliders[collider.order] = collider
+        group = self.layers.get(layer)
+        if group is None:
+            group = self.layers[layer] = Layer()
+        group.colliders.append(collider)
+        group.rects.append(collider.rect)
+        group.grid = None
+        group.scans.update(collider.collides_with)
+        return collider
+
+    def remove(self, collider: Collider):
+        if self.colliders.pop(collider.order, None) is None:
+            return
+        group = self.layers[collider.layer]
+        index = group.colliders.index(collider)
+        del group.colliders[index]
+        del group.rects[index]
+        group.grid = None
+        group.scans = set().union(*(other.collides_with for other in group.colliders))
+
+    def cells_of(self, rect: p.Rect) -> Tuple[Tuple[int, int], ...]:
+        size = self.cell_size
+        left, right = rect.left // size, (rect.right - 1) // size
+        top, bottom = rect.top // size, (rect.bottom - 1) // size
+        if left == right and top == bottom:
+            return (left, top),
+        return tuple((x, y) for x in range(left, right + 1) for y in range(top, bottom + 1))
+
+    def grid_of(self, group: Layer) -> Dict[Tuple[int, int], List[int]]:
+        if group.grid is None:
+            group.grid = {}
+            for index, rect in enumerate(group.rects):
+                for cell in self.cells_of(rect):
+                    group.grid.setdefault(cell, []).append(index)
+        return group.grid
+
+    def hits(self, rect: p.Rect, group: Layer, large: bool) -> List[int]:
+        """
+        indices of the colliders of ``group`` overlapping ``rect``, through the grid when ``large``
+        """
+        if not large:
+            return rect.collidelistall(group.rects)
+        grid, rects = self.grid_of(group), group.rects
+        found: Set[int] = set()
+        for cell in self.cells_of(rect):
+            found.update(grid.get(cell, ()))
+        return [index for index in found if rects[index].colliderect(rect)]
+
+    def overlaps(self, first: Layer, second: Layer) -> List[Tuple[Collider, Collider]]:
+        """
+        every overlapping (collider of ``first``, collider of ``second``) pair, iterating the smaller layer
+        """
+        flip = len(first) > len(second)
+        small, big = (second, first) if flip else (first, second)
+        large = len(small) > self.grid_threshold
+        pairs = []
+        for collider in small.colliders:
+            for index in self.hits(collider.rect, big, large):
+                other = big.colliders[index]
+                pairs.append((other, collider) if flip else (collider, other))
+        return pairs
+
+    def refresh(self):
+        """
+        re-reads dynamic rects, so queries see objects moved since the last step
+        """
+        for group in self.layers.values():
+            rects = group.rects
+            for index, collider in enumerate(group.colliders):
+                if not collider.static:
+                    collider.rect = rects[index] = collider.get_rect()
+            group.grid = None
+
+    def step(self):
+        self.refresh()
+        contacts: List[Tuple[int, int, Collider, Collider]] = []
+        for group in list(self.layers.values()):
+            for layer in group.scans:
+                other_group = self.layers.get(layer)
+                if other_group is None or not other_group.colliders:
+                    continue
+                for collider, other in self.overlaps(group, other_group):
+                    if collider is not other and layer in collider.collides_with:
+                        contacts.append((collider.order, other.order, collider, other))
+        contacts.sort(key=lambda contact: contact[:2])
+        delivered: Set[Tuple[int, int]] = set()
+        for _, _, collider, other in contacts:
+            if collider.order not in self.colliders or other.order not in self.colliders:
+                continue
+            if collider.layer in other.collides_with:
+                pair = min(collider.order, other.order), max(collider.order, other.order)
+                if pair in delivered:
+                    continue
+                delivered.add(pair)
+            if collider.on_contact:
+                collider.on_contact(other.owner)
+            if other.on_contact:
+                other.on_contact(collider.owner)
+
+    def query(self, rect: p.Rect, layers: Iterable[str]) -> List[Any]:
+        found: List[Collider] = []
+        for layer in layers:
+            group = self.layers.get(layer)
+            if group is not None:
+                large = len(group) > self.grid_threshold
+                found.extend(group.colliders[index] for index in self.hits(rect, group, large))
+        found.sort(key=lambda collider: collider.order)
+        return [collider.owner for collider in found]
+
+
+__all__ = ["CollisionWorld", "Collider"]
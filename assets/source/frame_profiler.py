@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Tuple
+import cProfile
+import io
+import pstats
+import time
+
+import numpy as np
+
+PHASES = ("events", "input", "update", "draw", "prewarm", "tick")
+Stats = Dict[str, Tuple[float, float, float, float]]
+
+
+class FrameProfiler:
+    """
+    per scene ring buffers of per phase frame durations, with an optional cProfile capture of the next frames
+
+    A frame is ``start``, ``lap`` calls naming the phase that just ran, then ``end``. A phase lapped more than
+    once in a frame adds up, so input and update interleaved over the frame's ticks are still told apart, phases
+    not lapped at all stay 0. Durations are kept in milliseconds, ``busy`` is the sum of every phase but the
+    ``idle`` ones (the frame cap sleep).
+
+    .. code-block:: python3
+
+        profiler = FrameProfiler()
+        profiler.start("Game")
+        app.handle_events()
+        profiler.lap("events")
+        for _ in range(ticks):
+            app.handle_input()
+            profiler.lap("input")
+            app.update()
+            profiler.lap("update")
+        ...
+        profiler.end()
+        profiler.stats("Game")["busy"]  # p50, p95, p99, worst in the buffer
+    """
+
+    def __init__(self, phases: Tuple[str, ...] = PHASES, size: int = 300, idle: Tuple[str, ...] = ("tick",)):
+        self.phases = phases
+        self.index = {phase: index for index, phase in enumerate(phases)}
+        self.columns = (*phases, "busy")
+        self.size = size
+        self.busy_mask = np.array([phase not in idle for phase in phases])
+        self.buffers: Dict[str, np.ndarray] = {}
+        self.frames: Dict[str, int] = {}
+        # worst busy frame seen per scene: busy ms, frame number, phase durations
+        self.worst: Dict[str, Tuple[float, int, Tuple[float, ...]]] = {}
+        self.scene = ""
+        self.laps: List[float] = []
+        self.last = 0.
+        self.profile: Optional[cProfile.Profile] = None
+        self.capture_frames = 0
+        self.capture_pending = 0
+
+    def start(self, scene: str):
+        if self.capture_pending:
+            self.capture_frames, self.capture_pending = self.capture_pending, 0
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        self.scene = scene
+        self.laps = [0.] * len(self.phases)
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.laps[self.index[phase]] += (now - self.last) * 1000
+        self.last = now
+
+    def end(self) -> Optional[pstats.Stats]:
+        """
+        stores the frame, returns the captured profile once its last frame ended
+        """
+        laps = self.laps
+        buffer = self.buffers.get(self.scene)
+        if buffer is None:
+            buffer = self.buffers[self.scene] = np.zeros((self.size, len(self.columns)))
+            self.frames[self.scene] = 0
+        frame = self.frames[self.scene]
+        row = buffer[frame % self.size]
+        row[:-1] = laps
+        busy = row[-1] = row[:-1][self.busy_mask].sum()
+        self.frames[self.scene] = frame + 1
+        if self.scene not in self.worst or busy > self.worst[self.scene][0]:
+            self.worst[self.scene] = float(busy), frame, tuple(laps)
+        if self.profile is not None:
+            self.capture_frames -= 1
+            if self.capture_frames <= 0:
+                self.profile.disable()
+                stats, self.profile = pstats.Stats(self.profile), None
+                return stats
+        return None
+
+    @property
+    def capturing(self) -> bool:
+        return self.profile is not None or bool(self.capture_pending)
+
+    def capture(self, frames: int):
+        """
+        profiles the next ``frames`` frames with cProfile
+        """
+        if not self.capturing:
+            self.capture_pending = frames
+
+    def phase_ms(self) -> Dict[str, float]:
+        return {phase: round(ms, 3) for phase, ms in zip(self.phases, self.laps)}
+
+    def stats(self, scene: str) -> Stats:
+        frames = self.frames.get(scene, 0)
+        if not frames:
+            return {}
+        # nearest rank percentiles of the sorted window, the last row is the worst frame
+        ordered = np.sort(self.buffers[scene][:min(frames, self.size)], axis=0)
+        last = len(ordered) - 1
+        rows = ordered[[round(last * 0.5), round(last * 0.95), round(last * 0.99), last]]
+        return {column: tuple(rows[:, index].tolist()) for index, column in enumerate(self.columns)}
+
+    def format(self, scene: str, columns: Optional[Tuple[str, ...]] = None) -> List[str]:
+        stats = self.stats(scene)
+        if not stats:
+            return []
+        width = max(len(column) for column in self.columns)
+        lines = [f"{scene.lower()} {min(self.frames[scene], self.size)} frames",
+                 " " * width + "".join(f"{label:>6}" for label in ("p50", "p95", "p99", "max"))]
+        for column in columns or self.columns:
+            lines.append(f"{column:<{width}}" + "".join(f"{ms:6.1f}" for ms in stats[column]))
+        return lines
+
+    def report(self) -> str:
+        lines = []
+        for scene in self.buffers:
+            lines.extend(self.format(scene))
+            busy, frame, laps = self.worst[scene]
+            lines.append(f"worst frame {frame}: {busy:.1f}ms busy (" +
+                         ", ".join(f"{phase} {ms:.1f}" for phase, ms in zip(self.phases, laps)) + ")")
+        return "\n".join(lines)
+
+
+def summarize(stats: pstats.Stats, limit: int = 20) -> str:
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return stream.getvalue()
+
+
+__all__ = ["FrameProfiler", "PHASES", "summarize"]
@@ -0,0 +1,115 @@
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+import struct
+
+MAGIC = b"PRP1"
+HEADER = struct.Struct("<4sQH")
+
+# one opcode byte per record, followed by its payload
+TICK = 0
+ACTION = 1
+KEY_EVENT = 2
+MOUSE_EVENT = 3
+MOUSE_PRESS = 4
+INITIALIZE = 5
+
+PAYLOADS = {
+    TICK: struct.Struct("<I"),  # state checksum after the update
+    ACTION: struct.Struct("<B"),  # index into the action table
+    KEY_EVENT: struct.Struct("<Ii"),  # event type, key
+    MOUSE_EVENT: struct.Struct("<IBhh"),  # event type, button, x, y
+    MOUSE_PRESS: struct.Struct("<Bhh"),  # button, x, y
+    INITIALIZE: struct.Struct("<"),
+}
+
+Record = Tuple[int, tuple]
+
+
+class InputLogWriter:
+    """
+    writes a scene's seed and every tick, bound action, event and mouse press fed to it, in call order
+
+    .. code-block:: python3
+
+        with open("match.pongrec", "wb") as file:
+            log = InputLogWriter(file, scene.seed, "Game", ["down", "up"])
+            log.action("up")
+            log.tick(scene.checksum())
+    """
+
+    def __init__(self, file: BinaryIO, seed: int, scene: str, actions: List[str]):
+        self.file = file
+        self.actions = {action: index for index, action in enumerate(actions)}
+        self.ticks = 0
+        names = [scene, *actions]
+        file.write(HEADER.pack(MAGIC, seed, len(names)))
+        for name in names:
+            encoded = name.encode()
+            file.write(struct.pack("<B", len(encoded)) + encoded)
+
+    def write(self, opcode: int, *payload):
+        self.file.write(bytes((opcode,)) + PAYLOADS[opcode].pack(*payload))
+
+    def tick(self, checksum: int = 0):
+        self.write(TICK, checksum & 0xFFFFFFFF)
+        self.ticks += 1
+
+    def action(self, action: str):
+        self.write(ACTION, self.actions[action])
+
+    def key_event(self, event_type: int, key: int):
+        self.write(KEY_EVENT, event_type, key)
+
+    def mouse_event(self, event_type: int, button: int, pos: Tuple[int, int]):
+        self.write(MOUSE_EVENT, event_type, button, *map(int, pos))
+
+    def mouse_press(self, button: int, pos: Tuple[int, int]):
+        self.write(MOUSE_PRESS, button, *map(int, pos))
+
+    def initialize(self):
+        self.write(INITIALIZE)
+
+    def close(self):
+        self.file.close()
+
+
+class InputLogReader:
+    """
+    reads a log written by InputLogWriter, records come back as (opcode, payload) with actions as names
+    """
+
+    def __init__(self, source: Union[bytes, BinaryIO]):
+        self.data = source if isinstance(source, bytes) else source.read()
+        magic, self.seed, count = HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            raise ValueError("not an input log")
+        offset = HEADER.size
+        names = []
+        for _ in range(count):
+            size = self.data[offset]
+            names.append(self.data[offset + 1:offset + 1 + size].decode())
+            offset += 1 + size
+        self.scene: str = names[0]
+        self.actions: List[str] = names[1:]
+        self.start = offset
+        self._ticks: Optional[int] = None
+
+    @property
+    def ticks(self) -> int:
+        if self._ticks is None:
+            self._ticks = sum(1 for opcode, _ in self if opcode == TICK)
+        return self._ticks
+
+    def __iter__(self) -> Iterator[Record]:
+        data, offset, end = self.data, self.start, len(self.data)
+        while offset < end:
+            opcode = data[offset]
+            payload = PAYLOADS[opcode]
+            values = payload.unpack_from(data, offset + 1)
+            offset += 1 + payload.size
+            if opcode == ACTION:
+                values = self.actions[values[0]],
+            yield opcode, values
+
+
+__all__ = ["InputLogWriter", "InputLogReader", "TICK", "ACTION", "KEY_EVENT", "MOUSE_EVENT", "MOUSE_PRESS",
+           "INITIALIZE"]
@@ -0,0 +1,179 @@
+from typing import Dict, Optional, Tuple
+import math
+import random
+
+# reaction delay in ticks after the ball turns towards the paddle, aim noise in pixels. Delays stay short, levels
+# mostly differ by how often the aim falls outside the paddle's half height (25 px)
+LEVELS: Dict[str, Tuple[int, float]] = {"easy": (12, 60.), "normal": (8, 30.), "hard": (4, 5.)}
+
+NONE = 0
+UP = 1
+DOWN = 2
+
+
+def fold(value: float, low: float, high: float) -> float:
+    """
+    position of a point moving freely from ``low`` to ``high`` once its reflections off both ends are unfolded
+    """
+    span = high - low
+    if span <= 0:
+        return low
+    offset = (value - low) % (2 * span)
+    return low + (offset if offset <= span else 2 * span - offset)
+
+
+def travel(velocity: float, friction: float, ticks: float) -> float:
+    """
+    distance moved in ``ticks`` ticks by a body moving ``velocity`` and then multiplying it by ``friction`` each
+    tick, ``math.inf`` ticks gives where it comes to rest
+    """
+    if friction == 1:
+        return velocity * ticks
+    if math.isinf(ticks):
+        return velocity / (1 - friction)
+    return velocity * (1 - friction ** ticks) / (1 - friction)
+
+
+def travel_ticks(distance: float, velocity: float, friction: float) -> Optional[float]:
+    """
+    ticks until ``travel`` covers ``distance``, None when it comes to rest first or moves the other way
+    """
+    if velocity == 0 or distance * velocity < 0:
+        return None
+    if friction == 1:
+        return distance / velocity
+    remaining = 1 - distance * (1 - friction) / velocity
+    if remaining <= 0:
+        return None
+    return math.log(remaining) / math.log(friction)
+
+
+def press_window(share: float, friction: float) -> float:
+    """
+    ticks before the crossing from which one press that moves a paddle ``share`` times its force by then lands at
+    least as close as the same press a tick later, ``math.inf`` when it always does
+    """
+    # a press k ticks ahead moves u(k) = travel(1, friction, k), the condition is u(k) + u(k - 1) <= 2 share
+    if friction == 1:
+        return share + 0.5
+    rest = (2 - 2 * share * (1 - friction)) / (1 + friction)
+    if rest <= 0:
+        return math.inf
+    if rest >= 1:
+        return 1.
+    return 1 + math.log(rest) / math.log(friction)
+
+
+class InterceptBot:
+    """
+    paddle controller aiming at where the ball will cross the paddle
+
+    The crossing point is solved once per ball velocity change, walls are unfolded analytically instead of
+    stepping the ball. Each tick the paddle's position at the crossing tick follows from its velocity and
+    friction in closed form. While that misses by more than ``reach``, the bot presses toward the crossing only when a
+    press now lands at least as close as the same press a tick later, so it doesn't overshoot. Once the paddle is
+    in reach its path doesn't change until the ball's velocity does, so later ticks skip the solve. The same goes
+    for the reaction delay, a press's control delay and the ticks before a press is due (``press_window``): the
+    bot only compares its ``resume`` tick until then.
+
+    .. code-block:: python3
+
+        bot = InterceptBot("normal", random.Random(seed))
+        mode = bot.control(game.bot, game.ball)
+        if mode:
+            game.bot.control(mode)
+    """
+
+    # ball speed is not damped by Ball.update, Ball.friction is unused there
+    ball_friction = 1.
+    # part of the paddle's half height the predicted crossing has to be within
+    reach = 0.6
+
+    def __init__(self, level: str = "normal", rng: Optional[random.Random] = None):
+        self.level = level
+        self.reaction, self.noise = LEVELS[level]
+        self.rng = rng or random.Random()
+        self.vx = self.vy = 0.
+        self.settled = False
+        self.incoming = False
+        self.target = 0.
+        self.arrival = math.inf
+        self.aim = 0.
+        # first tick of the rally the bot reacts on
+        self.ready = 0
+        # first tick the bot decides again: once it reacts, a press can be repeated or a press is about due
+        self.resume = 0
+        self.tolerance = 0.
+        self.tick = 0
+
+    def plan(self, pad, ball):
+        body, hit_box = ball.body, ball.body.hit_box
+        walls = ball.walls
+        pad_box = pad.body.hit_box
+        direction = 1 if pad_box.centerx > hit_box.centerx else -1
+        incoming = body.vx * direction > 0
+        if incoming and not self.incoming:
+            # a new rally towards the paddle: react late and aim a little off
+            self.ready = self.tick + self.reaction
+            self.aim = self.rng.uniform(-self.noise, self.noise)
+        # a new ball path voids any sleep planned for the old one
+        self.resume = self.ready
+        self.tolerance = self.reach * pad_box.h / 2
+        self.incoming = incoming
+        self.vx, self.vy = body.vx, body.vy
+        self.settled = False
+        if not incoming:
+            self.target, self.arrival = walls.centery, math.inf
+            return
+        left = body.x + body.offset_x
+        distance = pad_box.left - (left + hit_box.w) if direction > 0 else pad_box.right - left
+        ticks = travel_ticks(distance, body.vx, self.ball_friction)
+        if ticks is None:
+            self.target, self.arrival = walls.centery, math.inf
+            return
+        top = body.y + body.offset_y + travel(body.vy, self.ball_friction, ticks)
+        self.target = fold(top, walls.top, walls.bottom - hit_box.h) + hit_box.h / 2 + self.aim
+        self.arrival = self.tick + ticks
+
+    def control(self, pad, ball, ticks: int = 1) -> int:
+        self.tick += ticks
+        body = ball.body
+        if body.vx != self.vx or body.vy != self.vy:
+            self.plan(pad, ball)
+        elif self.settled:
+            return NONE
+        if self.tick < self.resume:
+            return NONE
+        pad_body = pad.body
+        if pad_body.last_press:
+            return NONE
+        pad_box = pad_body.hit_box
+        if not self.incoming:
+            hit_box = body.hit_box
+            if hit_box.right > pad_box.left and hit_box.left < pad_box.right:
+                # the ball is still leaving the paddle, moving away now could hit it again from behind
+                return NONE
+        ticks = max(0., self.arrival - self.tick)
+        friction = pad.friction
+        need = self.target - pad_box.centery - travel(pad_body.vy, friction, ticks)
+        if abs(need) <= self.tolerance:
+            self.settled = True
+            return NONE
+        mode, force = (DOWN, pad.down_force.y) if need > 0 else (UP, pad.up_force.y)
+        # a press adds travel(force) by the crossing, less the later it comes: press once now is at least as
+        # close as a tick later, the last moment it doesn't fall shorter
+        now = travel(force, friction, ticks)
+        later = travel(force, friction, ticks - 1) if ticks > 1 else 0.
+        if abs(now - need) > abs(later - need):
+            rest = travel(pad_body.vy, friction, math.inf)
+            if pad.walls.top < pad_box.top + rest and pad_box.bottom + rest < pad.walls.bottom:
+                # the paddle glides to a stop short of the walls, its path won't change before the press is due:
+                # sleep until a tick ahead of it
+                self.resume = self.tick + max(1, int(ticks - press_window(need / force, friction)) - 1)
+            return NONE
+        # the press blocks the paddle's next ones for its control delay
+        self.resume = self.tick + pad.control_delay
+        return mode
+
+
+__all__ = ["InterceptBot", "LEVELS", "fold", "travel", "travel_ticks", "press_window"]
@@ -0,0 +1,127 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+import json
+import logging
+import os
+import queue
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never waits for room in a bounded queue, records that don't fit are counted and dropped
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super(DroppingQueueHandler, self).__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class FrameFormatter(logging.Formatter):
+    """
+    one JSON object per line holding the record's ``frame`` fields
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({"time": round(record.created, 4), **record.frame}, separators=(",", ":"))
+
+
+def is_frame(record: logging.LogRecord) -> bool:
+    return hasattr(record, "frame")
+
+
+def is_text(record: logging.LogRecord) -> bool:
+    return not hasattr(record, "frame")
+
+
+class LogPipeline:
+    """
+    moves file and console output of loggers to a background thread
+
+    Loggers only put records into a bounded queue, so a slow disk can't stall the frame loop; when the writer
+    falls behind, new records are dropped and counted instead. ``pong.long.log`` and the JSON lines frame log
+    rotate by size, ``pong.log`` holds the current session. Records logged with ``extra={"frame": {...}}`` go
+    to the frame log only. Attached loggers are set to ``level`` until ``stop``, child loggers (the ``assets``
+    package ones under ``logging.getLogger("assets")``) reach the pipeline through them.
+
+    .. code-block:: python3
+
+        pipeline = LogPipeline([logging.getLogger("pong_game"), logging.getLogger("assets")])
+        pipeline.start()
+        logging.getLogger("pong_game.frames").info("frame", extra={"frame": {"frame": 1, "ms": 33}})
+        pipeline.stop()
+    """
+
+    def __init__(self, loggers: List[logging.Logger], directory: str = ".", max_bytes: int = 1 << 20,
+                 backups: int = 3, capacity: int = 4096, console: bool = True, level: int = logging.INFO):
+        self.loggers = loggers
+        self.level = level
+        # levels the loggers had before start, put back by stop
+        self.previous_levels: List[int] = []
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.queue: queue.Queue = queue.Queue(capacity)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.console = console
+        self.listener: Optional[QueueListener] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    @property
+    def running(self) -> bool:
+        return self.listener is not None
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def build_handlers(self) -> List[logging.Handler]:
+        handlers: List[logging.Handler] = [
+            RotatingFileHandler(self.path("pong.long.log"), maxBytes=self.max_bytes, backupCount=self.backups,
+                                delay=True),
+            logging.FileHandler(self.path("pong.log"), mode="w", delay=True),
+        ]
+        if self.console:
+            handlers.append(logging.StreamHandler())
+        for handler in handlers:
+            handler.addFilter(is_text)
+        frames = RotatingFileHandler(self.path("pong.frames.log"), maxBytes=self.max_bytes * 4,
+                                     backupCount=self.backups, delay=True)
+        frames.setFormatter(FrameFormatter())
+        frames.addFilter(is_frame)
+        handlers.append(frames)
+        return handlers
+
+    def start(self):
+        if self.running:
+            return
+        self.listener = QueueListener(self.queue, *self.build_handlers(), respect_handler_level=True)
+        self.listener.start()
+        self.previous_levels = [logger.level for logger in self.loggers]
+        for logger in self.loggers:
+            logger.addHandler(self.handler)
+            logger.setLevel(self.level)
+
+    def stop(self):
+        """
+        detaches from the loggers and blocks until queued records are written
+        """
+        if not self.running:
+            return
+        for logger, level in zip(self.loggers, self.previous_levels):
+            logger.removeHandler(self.handler)
+            logger.setLevel(level)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+
+
+__all__ = ["LogPipeline", "DroppingQueueHandler", "FrameFormatter"]
@@ -0,0 +1,104 @@
+from typing import Dict, Optional, Tuple
+import struct
+
+# packet type byte, followed by its payload
+JOIN = 1
+WELCOME = 2
+INPUT = 3
+LEAVE = 4
+SNAPSHOT = 5
+
+ANY_MATCH = 0xFFFF
+FULL = 0xFF
+NO_TICK = 0xFFFFFFFF
+
+PACKETS = {
+    JOIN: struct.Struct("<BH"),  # match id, ANY_MATCH for the first one with a free slot
+    WELCOME: struct.Struct("<BHBHHQ"),  # match id, slot (FULL when refused), tick rate, ticks per snapshot, seed
+    INPUT: struct.Struct("<BIIB"),  # input sequence number, newest snapshot tick received, paddle mode
+    LEAVE: struct.Struct("<B"),
+}
+SNAPSHOT_HEADER = struct.Struct("<BIIIH")  # tick, base tick or NO_TICK, last applied input, changed field mask
+
+# snapshot fields: name, struct format, scale of the quantized integer
+FIELDS: Tuple[Tuple[str, str, int], ...] = (
+    ("player_x", "h", 8), ("player_y", "h", 8), ("player_vy", "h", 64), ("player_last_press", "B", 1),
+    ("bot_x", "h", 8), ("bot_y", "h", 8), ("bot_vy", "h", 64), ("bot_last_press", "B", 1),
+    ("ball_x", "h", 8), ("ball_y", "h", 8), ("ball_vx", "h", 64), ("ball_vy", "h", 64),
+    ("player_score", "H", 1), ("bot_score", "H", 1), ("scoring_elapse", "B", 1),
+)
+FIELD_INDEX = {name: index for index, (name, _, _) in enumerate(FIELDS)}
+FIELD_STRUCTS = [struct.Struct("<" + fmt) for _, fmt, _ in FIELDS]
+LIMITS = {"h": (-0x8000, 0x7FFF), "H": (0, 0xFFFF), "B": (0, 0xFF)}
+FIELD_LIMITS = [LIMITS[fmt] for _, fmt, _ in FIELDS]
+
+Values = Tuple[int, ...]
+
+
+def quantize(state: Dict[str, float]) -> Values:
+    values = []
+    for (name, _, scale), (low, high) in zip(FIELDS, FIELD_LIMITS):
+        values.append(min(high, max(low, round(state[name] * scale))))
+    return tuple(values)
+
+
+def dequantize(values: Values) -> Dict[str, float]:
+    return {name: value / scale if scale != 1 else value for (name, _, scale), value in zip(FIELDS, values)}
+
+
+def encode_snapshot(tick: int, values: Values, input_seq: int, base_tick: int = NO_TICK,
+                    base: Optional[Values] = None) -> bytes:
+    """
+    snapshot holding only the fields that differ from ``base``, every field when there's no base
+    """
+    mask = 0
+    parts = []
+    for index, value in enumerate(values):
+        if base is None or base[index] != value:
+            mask |= 1 << index
+            parts.append(FIELD_STRUCTS[index].pack(value))
+    if base is None:
+        base_tick = NO_TICK
+    return SNAPSHOT_HEADER.pack(SNAPSHOT, tick, base_tick, input_seq, mask) + b"".join(parts)
+
+
+def decode_snapshot(data: bytes, bases: Dict[int, Values]) -> Optional[Tuple[int, int, Values]]:
+    """
+    (tick, last applied input, values) of a snapshot, None when its base isn't in ``bases``
+    """
+    _, tick, base_tick, input_seq, mask = SNAPSHOT_HEADER.unpack_from(data)
+    if base_tick == NO_TICK:
+        values = [0] * len(FIELDS)
+    elif base_tick in bases:
+        values = list(bases[base_tick])
+    else:
+        return None
+    offset = SNAPSHOT_HEADER.size
+    for index, field in enumerate(FIELD_STRUCTS):
+        if mask >> index & 1:
+            values[index], = field.unpack_from(data, offset)
+            offset += field.size
+    return tick, input_seq, tuple(values)
+
+
+def pack(kind: int, *payload) -> bytes:
+    return PACKETS[kind].pack(kind, *payload)
+
+
+def unpack(data: bytes) -> Tuple[int, tuple]:
+    """
+    packet type and payload, snapshots come back undecoded, unknown or short packets raise ValueError
+    """
+    if not data:
+        raise ValueError("empty packet")
+    kind = data[0]
+    if kind == SNAPSHOT:
+        return kind, (data,)
+    packet = PACKETS.get(kind)
+    if packet is None or len(data) != packet.size:
+        raise ValueError(f"malformed packet of type {kind}")
+    return kind, packet.unpack(data)[1:]
+
+
+__all__ = ["JOIN", "WELCOME", "INPUT", "LEAVE", "SNAPSHOT", "ANY_MATCH", "FULL", "NO_TICK", "FIELDS",
+           "FIELD_INDEX", "quantize", "dequantize", "encode_snapshot", "decode_snapshot", "pack", "unpack"]
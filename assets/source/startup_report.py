@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+import time
+
+
+class StartupReport:
+    """
+    breaks time to first frame into named phases
+
+    .. code-block:: python3
+
+        report = StartupReport()
+        with report.phase("display init"):
+            pg.display.init()
+        report.finish()
+        print(report.format())
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases: List[Tuple[str, float]] = []
+        self.total: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.total is not None
+
+    def add(self, name: str, seconds: float):
+        if not self.finished:
+            self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def finish(self):
+        if not self.finished:
+            self.total = time.perf_counter() - self.start
+
+    def format(self) -> str:
+        total = self.total if self.finished else time.perf_counter() - self.start
+        width = max([len(name) for name, _ in self.phases] + [len("other")])
+        lines = [f"time to first frame: {total * 1000:.1f}ms"]
+        for name, seconds in self.phases:
+            lines.append(f"  {name:<{width}} {seconds * 1000:8.1f}ms")
+        lines.append(f"  {'other':<{width}} {(total - sum(seconds for _, seconds in self.phases)) * 1000:8.1f}ms")
+        return "\n".join(lines)
+
+
+__all__ = ["StartupReport"]
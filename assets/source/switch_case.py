@@ -1,5 +1,6 @@
 from types import FunctionType
-from typing import Any, NoReturn
+from typing import Any, Callable, Dict, Hashable, List, NoReturn, Optional
+import threading
 
 
 class Switcher:
@@ -192,4 +193,109 @@ def case(_: Any) -> NoReturn:
     pass
 
 
-__all__ = ["switch", "case", "Switcher"]
+class CompiledSwitcher:
+    """
+    re-entrant, dict-backed switch and case
+
+    Switched values live on a per-thread stack instead of a shared module global, so switches can nest and
+    several scenes or threads can use one switcher. Every case is compiled once into a frozenset, checking it is
+    a single hash lookup. ``case()`` is the default branch, true while no earlier case of the switch matched.
+
+    .. example-code::
+
+     .. code-block:: python3
+
+        switcher = CompiledSwitcher()
+        switch, case = switcher.switch, switcher.case
+
+        with switch(value):
+            if case(value_to_check):
+                # code to run when value == value_to_check
+            elif case(other_value, another_value):
+                # code to run when value is one of them
+            if case():
+                # default
+    """
+
+    class Local(threading.local):
+        def __init__(self):
+            self.stack: List["CompiledSwitcher.Switch"] = []
+
+    class Switch:
+        __slots__ = ("value", "matched", "stack")
+
+        def __init__(self, value: Any, stack: List["CompiledSwitcher.Switch"]):
+            self.value = value
+            self.matched = False
+            self.stack = stack
+            stack.append(self)
+
+        def __enter__(self):
+            return None
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            self.stack.pop()
+
+    def __init__(self):
+        self.local = self.Local()
+        self.compiled: Dict[tuple, frozenset] = {}
+
+    def switch(self, value: Any) -> Switch:
+        return self.Switch(value, self.local.stack)
+
+    def case(self, *values: Any) -> bool:
+        """
+        Raises
+        ------
+            ValueError
+                 when you don't use switch
+        """
+        stack = self.local.stack
+        if not stack:
+            raise ValueError("First, you mast use switch")
+        frame = stack[-1]
+        if len(values) == 1:
+            values = values[0]
+            if not isinstance(values, tuple):
+                matched = frame.value == values
+                frame.matched = frame.matched or matched
+                return matched
+        elif not values:
+            return not frame.matched
+        try:
+            options = self.compiled.get(values)
+            if options is None:
+                options = self.compiled[values] = frozenset(values)
+            matched = frame.value in options
+        except TypeError:
+            # unhashable values can't be compiled, compare them one by one
+            matched = any(frame.value == option for option in values)
+        frame.matched = frame.matched or matched
+        return matched
+
+
+class Dispatcher:
+    """
+    O(1) switch over a table of branches, for hot paths that only call a function per value
+
+    .. code-block:: python3
+
+        on_event = Dispatcher({pg.KEYDOWN: key_down, (pg.KEYUP, pg.MOUSEBUTTONUP): release}, default=ignore)
+        on_event(event.type, event)
+    """
+
+    def __init__(self, branches: Dict[Hashable, Callable], default: Optional[Callable] = None):
+        self.branches: Dict[Hashable, Callable] = {}
+        for values, branch in branches.items():
+            for value in values if isinstance(values, tuple) else (values,):
+                self.branches[value] = branch
+        self.default = default
+
+    def __call__(self, value: Hashable, *args, **kwargs):
+        branch = self.branches.get(value, self.default)
+        if branch is not None:
+            return branch(*args, **kwargs)
+        return None
+
+
+__all__ = ["switch", "case", "Switcher", "CompiledSwitcher", "Dispatcher"]
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+import pygame as p
+
+
+class TextRun(NamedTuple):
+    """
+    pre-composited text: ``image`` is blitted at ``pos + bounds.topleft``, ``rect`` is the layout rect
+    that Scene.render_text returns (relative to ``pos``)
+    """
+    image: p.Surface
+    bounds: p.Rect
+    rect: p.Rect
+
+
+class TextCache:
+    """
+    bounded LRU cache of rendered text runs
+
+    .. code-block:: python3
+
+        cache = TextCache(128)
+        run = cache.get(key)
+        if run is None:
+            run = cache.put(key, build_run())
+    """
+
+    def __init__(self, max_size: int = 128):
+        self.max_size = max_size
+        self.runs: "OrderedDict[Hashable, TextRun]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.runs)
+
+    def get(self, key: Hashable) -> Optional[TextRun]:
+        run = self.runs.get(key)
+        if run is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.runs.move_to_end(key)
+        return run
+
+    def put(self, key: Hashable, run: TextRun) -> TextRun:
+        self.runs[key] = run
+        self.runs.move_to_end(key)
+        while len(self.runs) > self.max_size:
+            self.runs.popitem(last=False)
+        return run
+
+    def clear(self):
+        self.runs.clear()
+
+
+__all__ = ["TextCache", "TextRun"]
@@ -0,0 +1,87 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import pygame as p
+
+
+class GlyphMetrics:
+    """
+    size of every glyph of a sprite sheet at one scale, read from the sheet info without cutting any glyph
+
+    Sizes are truncated the way SpriteSheet scales glyphs, names the sheet doesn't have get the ``default`` size.
+    """
+
+    def __init__(self, info: Dict[str, Tuple[int, int, int, int]], default: str, scale: float = 1):
+        self.scale = scale
+        self.sizes: Dict[str, Tuple[int, int]] = {name: (int(w * scale), int(h * scale))
+                                                  for name, (_, _, w, h) in info.items()}
+        self.default = self.sizes[default]
+
+    def size(self, name: str) -> Tuple[int, int]:
+        return self.sizes.get(name, self.default)
+
+
+class TextStyle(NamedTuple):
+    """
+    spacing of laid out text, in pixels at the font's scale
+
+    ``tracking`` is the gap after every glyph, or the whole advance per character when not ``proportional``.
+    ``leading`` is the gap between lines. A proportional space is as wide and a proportional line as tall as the
+    last glyph, ``space`` and ``line`` are used before any glyph was placed (the default glyph's size when None).
+    """
+    tracking: int
+    leading: int = 0
+    proportional: bool = True
+    space: Optional[int] = None
+    line: Optional[int] = None
+
+
+class Layout(NamedTuple):
+    """
+    placed glyph run: names with their top left, ``bounds`` covers every glyph, ``rect`` is the layout rect
+    (widest line by the height of every line), all relative to the text's position
+    """
+    glyphs: Tuple[Tuple[str, int, int], ...]
+    bounds: p.Rect
+    rect: p.Rect
+
+
+def layout_text(text: Union[List[str], str], metrics: GlyphMetrics, style: TextStyle) -> Layout:
+    """
+    places every glyph of ``text`` without drawing, "\\n" breaks lines, a list item is one glyph name
+    """
+    tracking, leading, proportional = style.tracking, style.leading, style.proportional
+    last_w, last_h = (style.space if style.space is not None else metrics.default[0],
+                      style.line if style.line is not None else metrics.default[1])
+    x = y = widest = 0
+    left = top = right = bottom = 0
+    glyphs = []
+    for letter in [*text, "\n"]:
+        if letter == "\n":
+            widest = max(widest, x)
+            y += (last_h if proportional else 0) + leading
+            x = 0
+        elif letter == " ":
+            x += last_w if proportional else tracking
+        else:
+            last_w, last_h = metrics.size(letter)
+            if glyphs:
+                left, top = min(left, x), min(top, y)
+                right, bottom = max(right, x + last_w), max(bottom, y + last_h)
+            else:
+                left, top, right, bottom = x, y, x + last_w, y + last_h
+            glyphs.append((letter, x, y))
+            x += last_w + tracking if proportional else tracking
+    return Layout(tuple(glyphs), p.Rect(left, top, right - left, bottom - top), p.Rect(0, 0, widest, y))
+
+
+def draw_layout(surface: p.Surface, layout: Layout, font, pos: Tuple[int, int] = (0, 0),
+                special_flags: int = 0):
+    """
+    blits every glyph of ``layout`` from ``font`` (a SpriteSheet) in one ``Surface.blits`` call
+    """
+    x, y = pos
+    surface.blits([(font.get(name), (x + glyph_x, y + glyph_y), None, special_flags)
+                   for name, glyph_x, glyph_y in layout.glyphs], False)
+
+
+__all__ = ["GlyphMetrics", "TextStyle", "Layout", "layout_text", "draw_layout"]
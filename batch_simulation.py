@@ -0,0 +1,180 @@
+from typing import Optional
+import numpy as np
+
+from pong_game import Game
+import simulation
+
+
+class BatchSimulation:
+    """
+    steps many independent matches at once, keeping every match state in NumPy arrays
+
+    Rules mirror Player.update, Ball.update, Ball.bounce, Ball.clamp_pos, BallGoal.collide and Game.update
+    tick for tick, including pygame's truncation of float positions into hit box rects. The built-in bot is the
+    ball chasing one, as in a Game with ``bot_level`` None (the default), compare against such Games only.
+    Paddles only ever move vertically, so their x positions are kept as constants. Vectors are normalised
+    the way pg.Vector2 does it (multiplying by the reciprocal length) so results match bit for bit.
+
+    .. code-block:: python3
+
+        batch = BatchSimulation(10_000, seed=1)
+        batch.step(np.random.randint(0, 3, 10_000))
+        batch.scores  # (n, 2) array of player and bot score
+    """
+
+    def __init__(self, n: int, seed: Optional[int] = None, external_bot: bool = False,
+                 template: Optional[Game] = None):
+        game = template or simulation.Simulation(bot_level=None).game
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.external_bot = external_bot
+
+        self.walls = tuple(game.bounds)
+        self.max_bounds = tuple(game.max_bounds)
+        self.goals = [tuple(goal.rect) for goal in game.goals]
+        self.scoring_delay = game.scoring_delay
+
+        pads = (game.player, game.bot)
+        self.pad_x = np.array([pad.pos.x + pad.hit_box_offset.x for pad in pads])
+        self.pad_offset_y = np.array([pad.hit_box_offset.y for pad in pads])
+        self.pad_size = pads[0].hit_box.size
+        self.pad_friction = pads[0].friction
+        self.pad_forces = np.array([0, pads[0].up_force.y, pads[0].down_force.y])
+        self.control_delay = np.array([pad.control_delay for pad in pads])
+        self.ball_bounce = np.array(pads[0].ball_bounce)
+
+        ball = game.ball
+        self.ball_spawn = np.array(ball.pos)
+        self.ball_offset = np.array(ball.hit_box_offset)
+        self.ball_size = ball.hit_box.size
+        self.bounce_interval = ball.bounce_interval
+        self.pads_bounce_interval = ball.pads_bounce_interval
+        self.ball_vel_template = np.array(ball.vel)
+
+        self.pad_y = np.tile(np.array([pad.pos.y for pad in pads]), (n, 1))
+        self.pad_vel = np.zeros((n, 2))
+        self.last_press = np.zeros((n, 2), dtype=np.int64)
+
+        self.ball_pos = np.tile(self.ball_spawn, (n, 1))
+        self.ball_vel = self.random_velocities(n)
+        self.bounce_elapse = np.zeros(n, dtype=np.int64)
+        self.pads_bounce_elapse = np.zeros(n, dtype=np.int64)
+
+        self.scores = np.zeros((n, 2), dtype=np.int64)
+        self.scoring_elapse = np.zeros(n, dtype=np.int64)
+        self.tick = 0
+
+    def random_velocities(self, count: int) -> np.ndarray:
+        vel = self.rng.random((count, 2)) * 20 - 10
+        length = np.sqrt(vel[:, 0] * vel[:, 0] + vel[:, 1] * vel[:, 1])
+        ok = (length != 0) & (vel[:, 0] != 0)
+        vel[ok] = vel[ok] * (1 / length[ok, None]) * 10
+        vel[~ok] = (8, 9)
+        return vel
+
+    def ball_hit_box(self):
+        corner = np.trunc(self.ball_pos + self.ball_offset)
+        return corner[:, 0], corner[:, 1]
+
+    def pad_hit_box_y(self):
+        return np.trunc(self.pad_y + self.pad_offset_y)
+
+    def control(self, side: int, modes: np.ndarray):
+        press = (modes != 0) & (self.last_press[:, side] == 0)
+        self.pad_vel[:, side] += np.where(press, self.pad_forces[modes], 0)
+        self.last_press[:, side] += np.where(press, self.control_delay[side], 0)
+
+    def step(self, player_modes, bot_modes=None):
+        player_modes = np.broadcast_to(np.asarray(player_modes, dtype=np.int64), (self.n,))
+        self.control(0, player_modes)
+        if bot_modes is not None:
+            self.control(1, np.broadcast_to(np.asarray(bot_modes, dtype=np.int64), (self.n,)))
+
+        self.respawn_balls()
+        self.update_pads()
+        self.update_balls()
+        if not self.external_bot:
+            self.control_bots()
+        np.subtract(self.scoring_elapse, 1, out=self.scoring_elapse, where=self.scoring_elapse > 0)
+        self.tick += 1
+
+    def respawn_balls(self):
+        left, top, w, h = self.max_bounds
+        x, y = self.ball_hit_box()
+        out = ~((x >= left) & (y >= top) & (x + self.ball_size[0] <= left + w) & (y + self.ball_size[1] <= top + h))
+        count = int(out.sum())
+        if count:
+            self.ball_pos[out] = self.ball_spawn
+            self.ball_vel[out] = self.random_velocities(count)
+            self.bounce_elapse[out] = 0
+            self.pads_bounce_elapse[out] = 0
+
+    def update_pads(self):
+        _, top, _, h = self.walls
+        self.pad_y += self.pad_vel
+        self.pad_vel *= self.pad_friction
+        self.pad_y[self.pad_hit_box_y() < top] = top + 1
+        self.pad_y[self.pad_hit_box_y() + self.pad_size[1] > top + h] = top + h - self.pad_size[1] - 1
+        np.subtract(self.last_press, 1, out=self.last_press, where=self.last_press > 0)
+
+    def update_balls(self):
+        left, top, w, h = self.walls
+        right, bottom = left + w, top + h
+        bw, bh = self.ball_size
+        pos, vel = self.ball_pos, self.ball_vel
+        pos += vel
+
+        # Ball.bounce, every wall is checked against the hit box left by the previous check
+        can_bounce = self.bounce_elapse == 0
+        for axis, hit in ((0, lambda x, y: x < left), (0, lambda x, y: x + bw > right),
+                          (1, lambda x, y: y < top), (1, lambda x, y: y + bh > bottom)):
+            mask = can_bounce & hit(*self.ball_hit_box())
+            vel[mask, axis] *= -1
+            pos[mask] += vel[mask]
+            self.bounce_elapse[mask] += self.bounce_interval
+
+        # Ball.clamp_pos
+        x, _ = self.ball_hit_box()
+        pos[x < left, 0] = left + 21
+        x, _ = self.ball_hit_box()
+        pos[x + bw > right, 0] = right + bw
+        _, y = self.ball_hit_box()
+        mask = y < top
+        pos[mask, 1] = top + vel[mask, 1]
+        _, y = self.ball_hit_box()
+        pos[y + bh > bottom, 1] = bottom + bh
+
+        np.subtract(self.bounce_elapse, 1, out=self.bounce_elapse, where=self.bounce_elapse > 0)
+        np.subtract(self.pads_bounce_elapse, 1, out=self.pads_bounce_elapse, where=self.pads_bounce_elapse > 0)
+
+        x, y = self.ball_hit_box()
+        pad_y = self.pad_hit_box_y()
+        pw, ph = self.pad_size
+        for side in range(2):
+            px, py = self.pad_x[side], pad_y[:, side]
+            mask = ((x < px + pw) & (px < x + bw) & (y < py + ph) & (py < y + bh)) & (self.pads_bounce_elapse == 0)
+            if not mask.any():
+                continue
+            si = vel[mask] * self.ball_bounce
+            diff = np.stack((x[mask] + bw // 2 - (px + pw // 2), y[mask] + bh // 2 - (py[mask] + ph // 2)), axis=1)
+            length = np.sqrt(diff[:, 0] * diff[:, 0] + diff[:, 1] * diff[:, 1])
+            new = np.empty_like(diff)
+            ok = length != 0
+            new[ok] = diff[ok] * (1 / length[ok, None]) * 10
+            new[~ok] = (8, 6)
+            new[new[:, 0] == 0, 0] = 1
+            vel[mask] = np.copysign(new, si)
+            self.pads_bounce_elapse[mask] += self.pads_bounce_interval
+
+        for goal, side in zip(self.goals, (1, 0)):
+            gx, gy, gw, gh = goal
+            mask = (x < gx + gw) & (gx < x + bw) & (y < gy + gh) & (gy < y + bh) & (self.scoring_elapse == 0)
+            self.scores[mask, side] += 1
+            self.scoring_elapse[mask] += self.scoring_delay
+
+    def control_bots(self):
+        _, y = self.ball_hit_box()
+        ball_center = y + self.ball_size[1] // 2
+        bot_center = self.pad_hit_box_y()[:, 1] + self.pad_size[1] // 2
+        modes = np.where(bot_center > ball_center, 1, np.where(bot_center < ball_center, 2, 0))
+        self.control(1, modes)
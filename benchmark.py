@@ -0,0 +1,446 @@
+import argparse
+import random as rd
+import time
+
+import simulation
+
+
+def bench_sim(args: argparse.Namespace):
+    ticks = args.ticks
+    sim = simulation.Simulation()
+    rng = rd.Random(0)
+    modes = [rng.choice((simulation.NONE, simulation.UP, simulation.DOWN)) for _ in range(ticks)]
+    start = time.perf_counter()
+    for mode in modes:
+        sim.step(mode)
+    elapsed = time.perf_counter() - start
+    print(f"sim: {ticks} ticks in {elapsed:.3f}s -> {ticks / elapsed:,.0f} ticks/sec (score {sim.score})")
+
+
+def bench_scale(args: argparse.Namespace):
+    import statistics
+    import pong_game
+    import tournament
+
+    # a step at time_scale N has to play out exactly like N steps at 1 for the discrete ball, inputs only reach the
+    # first of them
+    rng = rd.Random(0)
+    steps = args.ticks // args.scale
+    modes = [rng.choice((simulation.NONE, simulation.UP, simulation.DOWN)) for _ in range(steps)]
+    for scene in (pong_game.Game, pong_game.Tutorial):
+        results = []
+        for time_scale in (1, args.scale):
+            sim = simulation.Simulation(scene, time_scale=time_scale, seed=0)
+            if scene is pong_game.Tutorial:
+                # straight to the first match, the dialogue pauses it again once the score decides a stage
+                sim.game.dialogue.stage = "2"
+            start = time.perf_counter()
+            for mode in modes:
+                sim.step(mode)
+                for _ in range(args.scale // time_scale - 1):
+                    sim.step()
+            elapsed = time.perf_counter() - start
+            results.append((sim.score, sim.game.checksum()))
+            print(f"scale {scene.__name__} discrete x{time_scale}: {sim.tick} steps in {elapsed:.3f}s, "
+                  f"score {sim.score}")
+        if results[0] != results[1]:
+            raise SystemExit(f"{scene.__name__} time_scale {args.scale} diverged from 1: {results}")
+
+    # the swept ball covers the N ticks in one sweep, the same path up to rounding, which the game's chaos blows up
+    # within a few hundred ticks once the paddles play. So the first ticks of matches between two ball chasing
+    # paddles have to agree to a fraction of a pixel, and their goal rates within three standard errors
+    chase = tournament.controller(tournament.Side("chase"), 0)
+    seeds, lockstep = 16, 200 // args.scale
+    blocks = max(lockstep, args.ticks // seeds // args.scale)
+    runs = []
+    for time_scale in (1, args.scale):
+        rates, traces = [], []
+        start = time.perf_counter()
+        for seed in range(seeds):
+            sim = simulation.Simulation(external_bot=True, swept=True, time_scale=time_scale, seed=seed)
+            game = sim.game
+            trace = []
+            for block in range(blocks):
+                sim.step((chase(game.player, game.ball), chase(game.bot, game.ball)))
+                for _ in range(args.scale // time_scale - 1):
+                    sim.step()
+                if block < lockstep:
+                    trace.append((*sim.score, *(value for body in (game.player.body, game.bot.body, game.ball.body)
+                                                for value in (body.x, body.y))))
+            rates.append(sum(sim.score) * 1000 / (blocks * args.scale))
+            traces.append(trace)
+        elapsed = time.perf_counter() - start
+        ticks = seeds * blocks * args.scale
+        mean, error = statistics.mean(rates), statistics.stdev(rates) / seeds ** .5
+        print(f"scale Game swept x{time_scale}: {seeds} matches x {blocks * args.scale} ticks in {elapsed:.3f}s -> "
+              f"{ticks / elapsed:,.0f} ticks/sec, {mean:.2f} +- {error:.2f} goals per 1000 ticks")
+        runs.append((mean, error, traces))
+    drift = max(abs(one - other) for first, second in zip(runs[0][2], runs[1][2])
+                for one_state, other_state in zip(first, second) for one, other in zip(one_state, other_state))
+    print(f"scale Game swept: first {lockstep * args.scale} ticks apart by at most {drift:.2e}px")
+    if drift > 1e-6:
+        raise SystemExit(f"swept time_scale {args.scale} left the path of time_scale 1 by {drift}px")
+    if abs(runs[0][0] - runs[1][0]) > 3 * (runs[0][1] ** 2 + runs[1][1] ** 2) ** .5:
+        raise SystemExit(f"swept time_scale {args.scale} changed the goal rate: {runs[0][:2]} vs {runs[1][:2]}")
+
+
+def bench_batch(args: argparse.Namespace):
+    import numpy as np
+    import batch_simulation
+
+    batch = batch_simulation.BatchSimulation(args.matches, seed=0)
+    steps = max(1, args.ticks // 100)
+    rng = np.random.default_rng(0)
+    modes = rng.integers(0, 3, (steps, args.matches))
+    start = time.perf_counter()
+    for step_modes in modes:
+        batch.step(step_modes)
+    elapsed = time.perf_counter() - start
+    ticks = steps * args.matches
+    print(f"batch: {args.matches} matches x {steps} steps in {elapsed:.3f}s -> {ticks / elapsed:,.0f} match ticks/sec")
+
+
+def bench_present(args: argparse.Namespace):
+    import pygame as pg
+    import pong_game
+
+    class PresentApp(pong_game.App):
+        def __init__(self, scene: pong_game.Scene):
+            self._scene = scene
+            self.done = True
+            self.full_present = True
+            self.overlay = False
+            self.display_mode = self.caption = self.icon = None
+            self.update_screen()
+
+    game = simulation.Simulation().game
+    frames = max(1, args.ticks // 100)
+    pg.display.init()
+    for mode, dirty in (("blit", False), ("scale", False), ("scale", True), ("scaled", False), ("scaled", True)):
+        game.settings["present"] = mode
+        game.settings["dirty_rects"] = dirty
+        app = PresentApp(game)
+        if app.present_mode != mode:
+            print(f"present {mode}: not supported by this video driver")
+            continue
+        game.app = app
+        game.screen = app.get_scene_screen()
+        game.full_redraw = True
+        app.draw()
+        start = time.perf_counter()
+        for _ in range(frames):
+            game.update()
+            app.draw()
+        elapsed = time.perf_counter() - start
+        print(f"present {mode}{' + dirty rects' if dirty else ''}: {elapsed / frames * 1000:.3f} ms/frame")
+    game.settings["present"] = "scale"
+    game.settings["dirty_rects"] = False
+
+
+def bench_collision(args: argparse.Namespace):
+    import pygame as pg
+    import pong_game
+
+    game = simulation.Simulation().game
+    rng = rd.Random(0)
+    for _ in range(args.balls - 1):
+        vel = pg.Vector2(rng.uniform(-10, 10), rng.uniform(-10, 10))
+        ball = pong_game.Ball(pg.Vector2(rng.uniform(30, 470), rng.uniform(20, 220)), vel, pg.Rect(0, 0, 10, 10),
+                              game.bl_img, game.bounds, 0, 5)
+        ball.add(game.balls_group)
+        game.world.add(ball, lambda ball=ball: ball.hit_box, "ball", ("pad", "goal"), ball.on_contact)
+    steps = max(1, args.ticks // 100)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        game.world.step()
+    world = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        for ball in game.balls_group:
+            for pad in game.players_group:
+                if ball.hit_box.colliderect(pad.hit_box):
+                    ball.bounce_off(pad)
+            for goal in game.goals:
+                goal.collide(ball.hit_box)
+    pairs = time.perf_counter() - start
+    print(f"collision: {args.balls} balls x {steps} steps -> world {world / steps * 1000:.3f} ms/step, "
+          f"all pairs {pairs / steps * 1000:.3f} ms/step")
+
+
+def bench_bullets(args: argparse.Namespace):
+    import pygame as pg
+    from assets.source.bullet_pool import BulletPool
+
+    game = simulation.Simulation().game
+    targets = (game.player.hit_box, game.bot.hit_box)
+    steps = max(1, args.ticks // 100)
+    rng = rd.Random(0)
+    spawns = [((rng.randrange(40, 470), rng.randrange(20, 230)), rng.choice((-5, 5))) for _ in range(args.bullets)]
+
+    # wide bounds keep every bullet alive, so each step moves and hit tests all of them
+    bounds = pg.Rect(-10 ** 6, -10 ** 6, 2 * 10 ** 6, 2 * 10 ** 6)
+    pool = BulletPool((5, 5))
+    for center, speed in spawns:
+        pool.spawn(center, speed, 1 if speed > 0 else 0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        pool.update(targets, bounds)
+    pooled = time.perf_counter() - start
+
+    bullets = []
+    for center, speed in spawns:
+        bullet = pg.Rect(0, 0, 5, 5)
+        bullet.center = center
+        bullets.append((bullet, speed))
+    start = time.perf_counter()
+    for _ in range(steps):
+        for bullet, speed in bullets:
+            if targets[1 if speed > 0 else 0].colliderect(bullet):
+                continue
+            bullet.x += speed
+            bounds.contains(bullet)
+    rects = time.perf_counter() - start
+    print(f"bullets: {args.bullets} bullets x {steps} steps -> pool {pooled / steps * 1000:.3f} ms/step, "
+          f"rect list {rects / steps * 1000:.3f} ms/step")
+
+
+def bench_switch(args: argparse.Namespace):
+    from assets.source import switch_case
+
+    rng = rd.Random(0)
+    values = [rng.choice((1, 2, 3, 4)) for _ in range(args.ticks)]
+    hits = [0, 0, 0, 0]
+
+    def run_switch(switch, case):
+        for value in values:
+            with switch(value):
+                if case(1):
+                    hits[0] += 1
+                elif case(2):
+                    hits[1] += 1
+                elif case((3, 5)):
+                    hits[2] += 1
+                if case():
+                    hits[3] += 1
+
+    def run_dispatcher():
+        def hit(index):
+            return lambda: hits.__setitem__(index, hits[index] + 1)
+        dispatch = switch_case.Dispatcher({1: hit(0), 2: hit(1), (3, 5): hit(2)}, default=hit(3))
+        for value in values:
+            dispatch(value)
+
+    compiled = switch_case.CompiledSwitcher()
+    for name, run in (("legacy", lambda: run_switch(switch_case.switch, switch_case.case)),
+                      ("compiled", lambda: run_switch(compiled.switch, compiled.case)),
+                      ("dispatcher", run_dispatcher)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"switch {name}: {args.ticks} switches in {elapsed:.3f}s -> {args.ticks / elapsed:,.0f} switches/sec")
+
+
+def bench_replay(args: argparse.Namespace):
+    import io
+    import replay
+    from assets.source.input_log import InputLogWriter
+
+    sim = simulation.Simulation(seed=0)
+    game = sim.game
+    rng = rd.Random(0)
+    actions = [rng.choice((None, "up", "down")) for _ in range(args.ticks)]
+    file = io.BytesIO()
+    log = InputLogWriter(file, game.seed, type(game).__name__, sorted(set(game.key_bindings.values())))
+    start = time.perf_counter()
+    for action in actions:
+        if action:
+            log.action(action)
+            game.handle_action(action)
+        game.update()
+        log.tick(game.checksum())
+    elapsed = time.perf_counter() - start
+    print(f"replay record: {args.ticks} ticks in {elapsed:.3f}s -> {args.ticks / elapsed:,.0f} ticks/sec "
+          f"({len(file.getvalue()):,} bytes)")
+    for verify in (False, True):
+        replayer = replay.Replayer(file.getvalue())
+        start = time.perf_counter()
+        ticks = replayer.run(verify)
+        elapsed = time.perf_counter() - start
+        print(f"replay {'verified' if verify else 'unverified'}: {ticks} ticks in {elapsed:.3f}s -> "
+              f"{ticks / elapsed:,.0f} ticks/sec (score {replayer.scene.player_score, replayer.scene.bot_score})")
+
+
+def bench_server(args: argparse.Namespace):
+    import netplay
+
+    sent = []
+
+    class Transport:
+        @staticmethod
+        def sendto(data: bytes, _):
+            sent.append(len(data))
+
+    server = netplay.MatchServer()
+    server.transport = Transport()
+    for index in range(args.net_matches):
+        server.join(("10.0.0.1", 1000 + index), index)
+    steps = max(1, args.ticks // args.net_matches)
+    start = time.perf_counter()
+    for _ in range(steps):
+        server.step()
+        # every peer acknowledges the newest snapshot, as on a loss free link
+        for _, peer in server.peers.values():
+            peer.acked = next(reversed(peer.sent), peer.acked)
+    elapsed = time.perf_counter() - start
+    ticks = steps * args.net_matches
+    snapshots = sent[args.net_matches:]
+    per_peer = sum(snapshots) / len(snapshots) * server.tick_rate / server.snapshot_every if snapshots else 0
+    print(f"server: {args.net_matches} matches x {steps} ticks in {elapsed:.3f}s -> {ticks / elapsed:,.0f} match "
+          f"ticks/sec, {elapsed / ticks * server.tick_rate * 100:.3f}% of a core per match, "
+          f"{sum(snapshots) / max(1, len(snapshots)):.1f} bytes/snapshot, {per_peer:,.0f} bytes/sec per peer")
+
+
+def bench_bot(args: argparse.Namespace):
+    rng = rd.Random(0)
+    modes = [rng.choice((simulation.NONE, simulation.UP, simulation.DOWN)) for _ in range(args.ticks)]
+    for level in (None, "easy", "normal", "hard"):
+        sim = simulation.Simulation(seed=0, external_bot=True, bot_level=level)
+        game = sim.game
+        presses = [0]
+        control = game.bot.control
+
+        def counted(mode: int):
+            presses[0] += 1
+            control(mode)
+
+        game.bot.control = counted
+        spent = 0.
+        for mode in modes:
+            sim.step(mode)
+            start = time.perf_counter()
+            game.control_bot()
+            spent += time.perf_counter() - start
+        print(f"bot {level or 'chase'}: {spent / args.ticks * 1e6:.2f} us/tick, {presses[0] / args.ticks:.2f} "
+              f"presses/tick, bot let in {game.player_score} and scored {game.bot_score} in {args.ticks} ticks")
+
+
+def bench_transition(args: argparse.Namespace):
+    import pygame as pg
+    import pong_game
+    from assets.source.startup_report import StartupReport
+
+    class TransitionApp(pong_game.App):
+        def __init__(self):
+            self.startup = StartupReport()
+            self.scene_factories = {"game": pong_game.Game, "menu": pong_game.Menu, "tutorial": pong_game.Tutorial}
+            self.scenes = {}
+            self.record_path, self.recorder, self.recorded = None, None, None
+            self.display_mode = self.caption = self.icon = None
+            self.done = True
+            self._scene = ...
+            self.scene = self.menu
+            self.done = False
+
+    pg.display.init()
+    app = TransitionApp()
+    # the tutorial's ret12 / ret23 stages bounce between the tutorial and the menu
+    switches = max(2, args.ticks // 1000)
+    for label, reset in (("cached", False), ("display reset", True)):
+        start = time.perf_counter()
+        worst = 0.
+        for index in range(switches):
+            if reset:
+                app.display_mode = None
+            app.scene = app.tutorial if index % 2 == 0 else app.menu
+            worst = max(worst, app.transition_ms)
+        elapsed = time.perf_counter() - start
+        print(f"transition {label}: {switches} switches, {elapsed / switches * 1000:.3f} ms/switch "
+              f"(worst {worst:.3f}ms)")
+
+
+def bench_glyphs(args: argparse.Namespace):
+    import pygame as pg
+    from assets.images import sprite_sheet
+
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    # dialogue style text, spaces and punctuation the sheet has no glyph for take the default one
+    text = "welcome to pong! (press enter) - ready? ~ #1"
+    source, info = sprite_sheet.load_image("alphabet.png"), sprite_sheet.registry.info("sprite_sheet.json")
+    for label, sheet in (("plain", sprite_sheet.SpriteSheet(source, info, "box", 6)),
+                         ("registry", sprite_sheet.load_sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 6))):
+        runs = max(1, args.ticks // 100)
+        start = time.perf_counter()
+        for _ in range(runs):
+            for char in text:
+                sheet.get(char)
+        elapsed = time.perf_counter() - start
+        print(f"glyphs {label}: {runs * len(text) / elapsed:,.0f} lookups/sec, hits {sheet.hits}, "
+              f"misses {sheet.misses}, generations {sheet.generations}")
+
+
+def bench_text(args: argparse.Namespace):
+    import pygame as pg
+    import pong_game
+    from assets.images import sprite_sheet
+    from assets.source.text_layout import TextStyle, layout_text
+
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    font = sprite_sheet.load_sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 2)
+    style = TextStyle(6, 2)
+    texts = [f"now you can shoot[space], when bullet\nhits pallet {index}"
+             for index in range(max(1, args.ticks // 100))]
+    for label, run in (("measure", lambda text: layout_text(text, font.metrics, style).rect),
+                       ("render", lambda text: pong_game.Scene.build_text_run(layout_text(text, font.metrics, style),
+                                                                            font))):
+        start = time.perf_counter()
+        for text in texts:
+            run(text)
+        elapsed = time.perf_counter() - start
+        print(f"text {label}: {len(texts)} texts, {elapsed / len(texts) * 1000:.3f} ms/text")
+
+
+def bench_sfx(args: argparse.Namespace):
+    import pygame as pg
+    from assets.sounds import sounds
+
+    pg.mixer.init()
+    mixer = sounds.SoundMixer()
+    start = time.perf_counter()
+    mixer.init()
+    print(f"sfx preload: {len(mixer.effects)} effects in {(time.perf_counter() - start) * 1000:.2f}ms")
+    names = list(mixer.effects)
+    plays = max(1, args.ticks // 10)
+    start = time.perf_counter()
+    for index in range(plays):
+        mixer.play(names[index % len(names)])
+    elapsed = time.perf_counter() - start
+    print(f"sfx play: {plays} plays, {elapsed / plays * 1e6:.2f} us/play, {mixer.stolen} voices stolen")
+    mixer.stop()
+
+
+BENCHMARKS = {"sim": bench_sim, "scale": bench_scale, "batch": bench_batch, "present": bench_present,
+              "switch": bench_switch, "collision": bench_collision, "bullets": bench_bullets, "replay": bench_replay,
+              "server": bench_server, "bot": bench_bot, "transition": bench_transition, "glyphs": bench_glyphs,
+              "text": bench_text, "sfx": bench_sfx}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pong performance benchmarks")
+    parser.add_argument("name", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("-n", "--ticks", type=int, default=100_000)
+    parser.add_argument("-m", "--matches", type=int, default=10_000)
+    parser.add_argument("-b", "--balls", type=int, default=500)
+    parser.add_argument("--bullets", type=int, default=2_000)
+    parser.add_argument("--net-matches", type=int, default=200)
+    parser.add_argument("-s", "--scale", type=int, default=4, help="time_scale compared against 1 by scale")
+    args = parser.parse_args()
+    for name in sorted(BENCHMARKS) if args.name == "all" else [args.name]:
+        BENCHMARKS[name](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,27 @@
+import argparse
+import time
+
+start = time.perf_counter()
+
 import pygame as pg
 import pong_game
+from assets.source.startup_report import StartupReport
 
+startup = StartupReport(start)
+startup.add("imports", time.perf_counter() - start)
 
-pg.init()
+with startup.phase("pygame init"):
+    pg.init()
 
 
 def main():
-    app = pong_game.App()
+    parser = argparse.ArgumentParser(description="pong")
+    parser.add_argument("--record", metavar="PATH", help="write the first match's input log, see replay.py")
+    parser.add_argument("--fps", type=int, default=pong_game.App.fps,
+                        help="frame cap, the game itself always ticks at %d per second" % pong_game.App.tick_rate)
+    args = parser.parse_args()
+    app = pong_game.App(startup, prewarm=("game", "tutorial"), record=args.record)
+    app.fps = args.fps
     app.run()
 
 
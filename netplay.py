@@ -0,0 +1,410 @@
+from typing import Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import logging
+import select
+import socket
+import time
+
+import pygame as pg
+
+from pong_game import App, Game
+from simulation import Simulation
+from assets.source import net_protocol as net
+from assets.sounds import sounds
+
+logger = logging.getLogger(__name__)
+
+Address = Tuple[str, int]
+
+
+def match_state(game: Game) -> Dict[str, float]:
+    state: Dict[str, float] = {}
+    for name, sprite in (("player", game.player), ("bot", game.bot)):
+        body = sprite.body
+        state[f"{name}_x"], state[f"{name}_y"], state[f"{name}_vy"] = body.x, body.y, body.vy
+        state[f"{name}_last_press"] = body.last_press
+    body = game.ball.body
+    state["ball_x"], state["ball_y"], state["ball_vx"], state["ball_vy"] = body.x, body.y, body.vx, body.vy
+    state["player_score"], state["bot_score"] = game.player_score, game.bot_score
+    state["scoring_elapse"] = game.scoring_elapse
+    return state
+
+
+def apply_state(game: Game, state: Dict[str, float]):
+    for name, sprite in (("player", game.player), ("bot", game.bot)):
+        body = sprite.body
+        body.x, body.y, body.vx, body.vy = state[f"{name}_x"], state[f"{name}_y"], 0., state[f"{name}_vy"]
+        body.last_press = int(state[f"{name}_last_press"])
+        body.sync()
+    body = game.ball.body
+    body.x, body.y, body.vx, body.vy = state["ball_x"], state["ball_y"], state["ball_vx"], state["ball_vy"]
+    body.sync()
+    game.player_score, game.bot_score = int(state["player_score"]), int(state["bot_score"])
+    game.scoring_elapse = int(state["scoring_elapse"])
+
+
+class Peer:
+    """
+    one remote paddle: its newest input and the snapshots sent to it, kept as delta bases until acknowledged
+    """
+    history = 32
+
+    def __init__(self, address: Address, slot: int, now: float):
+        self.address = address
+        self.slot = slot
+        self.mode = 0
+        self.input_seq = 0
+        self.acked = net.NO_TICK
+        self.sent: Dict[int, net.Values] = {}
+        self.last_seen = now
+
+    def snapshot(self, tick: int, values: net.Values) -> bytes:
+        base = self.sent.get(self.acked)
+        data = net.encode_snapshot(tick, values, self.input_seq, self.acked, base)
+        self.sent[tick] = values
+        if len(self.sent) > self.history:
+            # dicts keep insertion order, the first key is the oldest tick
+            del self.sent[next(iter(self.sent))]
+        return data
+
+
+class Match:
+    """
+    headless Game with up to two remote paddles, the bot plays a free right slot
+    """
+
+    def __init__(self, match_id: int, seed: Optional[int] = None):
+        self.id = match_id
+        self.sim = Simulation(seed=seed)
+        self.peers: List[Optional[Peer]] = [None, None]
+
+    @property
+    def game(self) -> Game:
+        return self.sim.game
+
+    @property
+    def empty(self) -> bool:
+        return self.peers == [None, None]
+
+    def free_slot(self) -> Optional[int]:
+        return self.peers.index(None) if None in self.peers else None
+
+    def join(self, peer: Peer):
+        self.peers[peer.slot] = peer
+        self.game.auto_bot = self.peers[1] is None
+
+    def leave(self, peer: Peer):
+        self.peers[peer.slot] = None
+        self.game.auto_bot = self.peers[1] is None
+
+    def step(self):
+        modes = [peer.mode if peer else 0 for peer in self.peers]
+        self.sim.step((modes[0], modes[1]))
+
+    def values(self) -> net.Values:
+        return net.quantize(match_state(self.game))
+
+
+class MatchServer(asyncio.DatagramProtocol):
+    """
+    authoritative UDP server running many matches in one process
+
+    Every match steps ``tick_rate`` times per second, every ``snapshot_every`` ticks each peer gets a snapshot
+    delta compressed against the newest snapshot it acknowledged. Clients send their held paddle mode every
+    tick, the server applies the newest one it has.
+
+    .. code-block:: python3
+
+        server = MatchServer()
+        await server.serve("127.0.0.1", 7021)
+    """
+
+    def __init__(self, tick_rate: int = App.tick_rate, snapshot_every: int = 2, timeout: float = 5):
+        self.tick_rate = tick_rate
+        self.snapshot_every = snapshot_every
+        self.timeout = timeout
+        self.matches: Dict[int, Match] = {}
+        self.peers: Dict[Address, Tuple[Match, Peer]] = {}
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.tick = 0
+        self.bytes_sent = 0
+        self.snapshots_sent = 0
+        self.running = False
+
+    def connection_made(self, transport: asyncio.BaseTransport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, address: Address):
+        try:
+            kind, payload = net.unpack(data)
+        except ValueError:
+            return
+        if kind == net.INPUT:
+            entry = self.peers.get(address)
+            if entry is None:
+                return
+            peer = entry[1]
+            seq, acked, mode = payload
+            # inputs can arrive out of order, only newer ones count
+            if seq > peer.input_seq:
+                peer.input_seq, peer.mode = seq, mode if mode in (0, 1, 2) else 0
+            if acked != net.NO_TICK and (peer.acked == net.NO_TICK or acked > peer.acked):
+                peer.acked = acked
+            peer.last_seen = time.monotonic()
+        elif kind == net.JOIN:
+            self.join(address, payload[0])
+        elif kind == net.LEAVE:
+            self.leave(address)
+
+    def join(self, address: Address, match_id: int):
+        if address in self.peers:
+            match, peer = self.peers[address]
+        else:
+            match = self.find_match(match_id)
+            slot = None if match is None else match.free_slot()
+            if slot is None:
+                self.send(net.pack(net.WELCOME, match_id, net.FULL, self.tick_rate, self.snapshot_every, 0),
+                          address)
+                return
+            peer = Peer(address, slot, time.monotonic())
+            match.join(peer)
+            self.peers[address] = match, peer
+            logger.info(f"{address[0]}:{address[1]} joined match {match.id} in slot {slot}")
+        self.send(net.pack(net.WELCOME, match.id, peer.slot, self.tick_rate, self.snapshot_every,
+                           match.game.seed), address)
+
+    def find_match(self, match_id: int) -> Optional[Match]:
+        if match_id == net.ANY_MATCH:
+            for match in self.matches.values():
+                if match.free_slot() is not None:
+                    return match
+            match_id = next(index for index in range(net.ANY_MATCH) if index not in self.matches)
+        if match_id not in self.matches:
+            self.matches[match_id] = Match(match_id)
+        return self.matches[match_id]
+
+    def leave(self, address: Address):
+        entry = self.peers.pop(address, None)
+        if entry is None:
+            return
+        match, peer = entry
+        match.leave(peer)
+        if match.empty:
+            del self.matches[match.id]
+        logger.info(f"{address[0]}:{address[1]} left match {match.id}")
+
+    def send(self, data: bytes, address: Address):
+        if self.transport is not None:
+            self.transport.sendto(data, address)
+            self.bytes_sent += len(data)
+
+    def step(self):
+        now = time.monotonic()
+        for address in [address for address, (_, peer) in self.peers.items() if now - peer.last_seen > self.timeout]:
+            self.leave(address)
+        self.tick += 1
+        broadcast = self.tick % self.snapshot_every == 0
+        for match in self.matches.values():
+            match.step()
+            if broadcast:
+                values = match.values()
+                for peer in match.peers:
+                    if peer is not None:
+                        self.send(peer.snapshot(self.tick, values), peer.address)
+                        self.snapshots_sent += 1
+
+    async def run(self):
+        """
+        steps every match at the tick rate until ``stop``, late ticks are caught up, not skipped
+        """
+        loop = asyncio.get_running_loop()
+        step = 1 / self.tick_rate
+        next_tick = loop.time()
+        self.running = True
+        while self.running:
+            self.step()
+            next_tick += step
+            await asyncio.sleep(max(0., next_tick - loop.time()))
+
+    async def serve(self, host: str, port: int):
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        try:
+            await self.run()
+        finally:
+            self.transport.close()
+
+    def stop(self):
+        self.running = False
+
+
+class MatchClient:
+    """
+    non-blocking UDP client polled from the frame loop, keeps the snapshots it may get deltas against
+    """
+    history = 64
+
+    def __init__(self, host: str, port: int):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.sock.setblocking(False)
+        self.match_id = net.ANY_MATCH
+        self.slot = 0
+        self.tick_rate = App.tick_rate
+        self.snapshot_every = 1
+        self.seed = 0
+        self.input_seq = 0
+        self.snapshots: Dict[int, net.Values] = {}
+        self.newest = net.NO_TICK
+
+    def join(self, match_id: int = net.ANY_MATCH, timeout: float = 5, retry: float = 0.25):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.sock.send(net.pack(net.JOIN, match_id))
+            ready, _, _ = select.select([self.sock], [], [], retry)
+            if not ready:
+                continue
+            for kind, payload in self.receive():
+                if kind == net.WELCOME:
+                    self.match_id, self.slot, self.tick_rate, self.snapshot_every, self.seed = payload
+                    if self.slot == net.FULL:
+                        raise ConnectionRefusedError(f"match {self.match_id} is full")
+                    return
+        raise TimeoutError("no answer from the match server")
+
+    def receive(self) -> List[Tuple[int, tuple]]:
+        packets = []
+        while True:
+            try:
+                data = self.sock.recv(512)
+            except (BlockingIOError, ConnectionRefusedError):
+                return packets
+            try:
+                packets.append(net.unpack(data))
+            except ValueError:
+                continue
+
+    def send_input(self, mode: int) -> int:
+        self.input_seq += 1
+        self.sock.send(net.pack(net.INPUT, self.input_seq, self.newest, mode))
+        return self.input_seq
+
+    def poll(self) -> Optional[Tuple[int, int, net.Values]]:
+        """
+        newest snapshot received since the last poll as (tick, last applied input, values)
+        """
+        newest = None
+        for kind, payload in self.receive():
+            if kind != net.SNAPSHOT:
+                continue
+            snapshot = net.decode_snapshot(payload[0], self.snapshots)
+            if snapshot is None or (self.newest != net.NO_TICK and snapshot[0] <= self.newest):
+                continue
+            tick, _, values = snapshot
+            self.snapshots[tick] = values
+            self.newest = tick
+            newest = snapshot
+        while len(self.snapshots) > self.history:
+            del self.snapshots[next(iter(self.snapshots))]
+        return newest
+
+    def close(self):
+        try:
+            self.sock.send(net.pack(net.LEAVE))
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class NetGame(Game):
+    """
+    Game scene drawing a remote match
+
+    The own paddle is predicted: each snapshot resets the scene to the server's state, then the inputs the
+    server hadn't applied yet are played again with the local paddle physics. Ball and the other paddle are
+    extrapolated with their own update until the next snapshot corrects them.
+    """
+
+    def __init__(self, app, client: MatchClient):
+        super(NetGame, self).__init__(app, client.seed)
+        self.client = client
+        self.auto_bot = False
+        self.own = self.bot if client.slot == 1 else self.player
+        self.other = self.player if client.slot == 1 else self.bot
+        self.mode = 0
+        self.inputs: List[Tuple[int, int]] = []
+
+    def handle_action(self, action: str):
+        if action == "up":
+            self.mode = 1
+        elif action == "down":
+            self.mode = 2
+
+    def update(self):
+        for sprite in (*self.players_group, *self.balls_group):
+            sprite.body.snapshot()
+        self.inputs.append((self.client.send_input(self.mode), self.mode))
+        self.mode = 0
+        snapshot = self.client.poll()
+        if snapshot is None:
+            self.predict(self.inputs[-1:])
+            return
+        _, applied, values = snapshot
+        apply_state(self, net.dequantize(values))
+        self.inputs = [(seq, mode) for seq, mode in self.inputs if seq > applied]
+        # older inputs were heard when first predicted
+        with sounds.mixer.muted():
+            self.predict(self.inputs[:-1])
+        self.predict(self.inputs[-1:])
+
+    def predict(self, inputs: List[Tuple[int, int]]):
+        for _, mode in inputs:
+            if mode:
+                self.own.control(mode)
+            self.own.update()
+            self.other.update()
+            self.ball.update(pads=self.players_group)
+
+    def checksum(self) -> int:
+        return 0
+
+
+def serve(args: argparse.Namespace):
+    server = MatchServer(args.tick_rate, args.snapshot_every)
+    logger.info(f"serving matches on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+def play(args: argparse.Namespace):
+    client = MatchClient(args.host, args.port)
+    client.join(args.match)
+    pg.init()
+    app = App()
+    app.tick_rate = client.tick_rate
+    app.scene_factories["net"] = lambda scene_app: NetGame(scene_app, client)
+    app.scene = app.get_scene("net")
+    try:
+        app.run()
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="networked pong matches")
+    parser.add_argument("mode", choices=("serve", "play"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7021)
+    parser.add_argument("--match", type=int, default=net.ANY_MATCH, help="match id to join, any free one by default")
+    parser.add_argument("--tick-rate", type=int, default=App.tick_rate)
+    parser.add_argument("--snapshot-every", type=int, default=2, help="ticks between snapshots")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    {"serve": serve, "play": play}[args.mode](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,47 +1,143 @@
 from typing import Callable, List, Optional, Tuple, Union, Dict, Any
 import pygame as pg
 
-from assets.source.switch_case import switch, case
+from assets.source.switch_case import CompiledSwitcher
+from assets.source.text_cache import TextCache, TextRun
+from assets.source.text_layout import Layout, TextStyle, draw_layout, layout_text
+from assets.source.startup_report import StartupReport
+from assets.source.collision_world import CollisionWorld, Collider
+from assets.source.bullet_pool import BulletPool
+from assets.source.input_log import InputLogWriter
+from assets.source.log_pipeline import LogPipeline
+from assets.source.frame_profiler import FrameProfiler, summarize
+from assets.source.intercept_bot import InterceptBot
 from assets.images import sprite_sheet as sp_sh
 from assets.sounds import sounds
 import random as rd
 import math as mh
 import logging
+import os
+import struct
+import time
 import webbrowser as wb
-
-pg.display.init()
+import zlib
 
 logger = logging.getLogger(__name__)
+# one structured record per frame, written to the frame log by App's log pipeline
+frame_logger = logger.getChild("frames")
 
-handler = logging.StreamHandler()
-logger.addHandler(handler)
-
-handler = logging.FileHandler(filename="pong.long.log")
-logger.addHandler(handler)
-
-handler = logging.FileHandler(filename="pong.log", mode="w")
-logger.addHandler(handler)
+switcher = CompiledSwitcher()
+switch, case = switcher.switch, switcher.case
 
 
 def multiply_vec(vec1: pg.Vector2, vec2: pg.Vector2):
     return pg.Vector2(vec1.x * vec2.x, vec1.y * vec2.y)
 
 
-class App:
-    all_keycodes = tuple(getattr(pg.constants, key_str) for key_str in
-                         filter(lambda k: k.startswith("K_"), dir(pg.constants)))
-    fps = 30
+def sweep_time(box: Tuple[float, float, float, float], delta: Tuple[float, float],
+               target: pg.Rect) -> Optional[float]:
+    """
+    fraction of ``delta`` after which box (x, y, w, h) moving by delta starts to overlap target,
+    0 when it already overlaps, None when it doesn't reach it
+    """
+    enter, leave = 0.0, 1.0
+    for start, size, move, low, high in ((box[0], box[2], delta[0], target.left, target.right),
+                                         (box[1], box[3], delta[1], target.top, target.bottom)):
+        if move == 0:
+            if start + size <= low or start >= high:
+                return None
+            continue
+        first, last = (low - start - size) / move, (high - start) / move
+        if first > last:
+            first, last = last, first
+        enter, leave = max(enter, first), min(leave, last)
+        if enter >= leave:
+            return None
+    return enter
 
-    def __init__(self):
-        self.game = Game(self)
-        self.menu = Menu(self)
-        self.tutorial = Tutorial(self)
+
+class App:
+    # simulation steps per second, every gameplay timer counts these
+    tick_rate = 30
+    # frame cap, frames are drawn between ticks with interpolated positions
+    fps = 60
+    # a frame runs at most this many ticks to catch up, beyond that the game slows down instead of stalling
+    max_ticks_per_frame = 8
+    overlay_key = pg.K_F3
+    capture_key = pg.K_F4
+    capture_frames = 120
+    # overlay text is rebuilt this often, so the text cache isn't flooded with one run per frame
+    overlay_interval = 15
+    # fixed width rows of the scale 1 overlay font
+    overlay_style = TextStyle(5, 8, proportional=False)
+    music = "pong_bgm.wav"
+
+    def __init__(self, startup: Optional[StartupReport] = None, prewarm: Tuple[str, ...] = (),
+                 record: Optional[str] = None, log_dir: str = "."):
+        self.startup = startup or StartupReport()
+        with self.startup.phase("logging"):
+            self.log_dir = log_dir
+            # the assets package loggers (sprite sheets, sounds) write to the same files
+            self.logs = LogPipeline([logger, logging.getLogger("assets")], log_dir)
+            self.logs.start()
+        self.frame = 0
+        self.ticks = 0
+        self.profiler = FrameProfiler()
+        self.overlay = False
+        self.overlay_text = ""
+        # what the overlay text covers, measured again only when the text is rebuilt
+        self.overlay_rect = pg.Rect(0, 0, 0, 0)
+        self.overlay_font: Optional[sp_sh.SpriteSheet] = None
+        # input log of the first match scene entered, replayed with replay.py
+        self.record_path = record
+        self.recorder: Optional[InputLogWriter] = None
+        self.recorded: Optional[Scene] = None
+        with self.startup.phase("display init"):
+            pg.display.init()
+        # scenes are built the first time they are needed, prewarmed ones one per frame after the first frame
+        self.scene_factories: Dict[str, Callable[[App], Scene]] = {"game": Game, "menu": Menu, "tutorial": Tutorial}
+        self.scenes: Dict[str, Scene] = {}
+        self.prewarm_queue: List[str] = list(prewarm)
         self._scene: Scene = ...
         self.screen: pg.Surface = ...
+        # (present mode, size, scale) the display was last set to, transitions between scenes sharing it keep it
+        self.display_mode: Optional[Tuple[str, Tuple[int, int], Tuple[int, int]]] = None
+        self.caption: Optional[str] = None
+        self.icon: Optional[pg.Surface] = None
+        self.transition_ms = 0.
         self.done = True
+        self.full_present = True
         self.clock = pg.time.Clock()
-        self.scene = self.menu
-        self.bgm = sounds.get_song("pong_bgm.wav")
+        menu = self.menu
+        with self.startup.phase("display mode"):
+            self.scene = menu
+        with self.startup.phase("audio load"):
+            # effects are preloaded, the music is streamed once the game runs
+            sounds.mixer.init()
+
+    def get_scene(self, name: str) -> "Scene":
+        if name not in self.scenes:
+            with self.startup.phase(f"build {name}"):
+                self.scenes[name] = self.scene_factories[name](self)
+        return self.scenes[name]
+
+    @property
+    def game(self) -> "Game":
+        return self.get_scene("game")
+
+    @property
+    def menu(self) -> "Menu":
+        return self.get_scene("menu")
+
+    @property
+    def tutorial(self) -> "Tutorial":
+        return self.get_scene("tutorial")
+
+    def prewarm(self):
+        while self.prewarm_queue and self.prewarm_queue[0] in self.scenes:
+            self.prewarm_queue.pop(0)
+        if self.prewarm_queue:
+            self.get_scene(self.prewarm_queue.pop(0))
 
     @property
     def scene(self) -> "Scene":
@@ -49,58 +145,254 @@ class App:
 
     @scene.setter
     def scene(self, value: "Scene"):
+        start = time.perf_counter()
+        previous = self._scene
         self._scene = value
         if not self.done:
             self._scene.initialize()
+            self.record_initialize()
         self.update_screen()
+        self.transition_ms = (time.perf_counter() - start) * 1000
+        if not self.done:
+            logger.info(f"scene {type(previous).__name__} -> {type(value).__name__} in {self.transition_ms:.2f}ms")
 
     @property
     def scene_scale(self):
+        if self.present_mode == "scaled":
+            # SDL scales the logical display itself and reports mouse positions in scene pixels
+            return 1, 1
         return self.scene.settings["scale"][0] / self.scene.settings["size"][0], self.scene.settings["scale"][1] / \
                self.scene.settings["size"][1]
 
+    @property
+    def present_mode(self) -> str:
+        return self.scene.settings.get("present", "scale")
+
     def update_screen(self):
-        pg.display.set_mode(self.scene.settings["scale"])
-        pg.display.set_caption(self.scene.settings["title"])
-        if self.scene.settings["icon"]:
-            pg.display.set_icon(self.scene.settings["icon"])
+        settings = self.scene.settings
+        if (self.present_mode, tuple(settings["size"]), tuple(settings["scale"])) != self.display_mode or \
+                pg.display.get_surface() is None:
+            if self.present_mode == "scaled":
+                try:
+                    pg.display.set_mode(settings["size"], pg.SCALED)
+                except pg.error as error:
+                    logger.warning(f"SCALED display mode unavailable ({error}), falling back to software scaling")
+                    settings["present"] = "scale"
+            if self.present_mode != "scaled":
+                pg.display.set_mode(settings["scale"])
+            self.display_mode = self.present_mode, tuple(settings["size"]), tuple(settings["scale"])
+        if settings["title"] != self.caption:
+            pg.display.set_caption(settings["title"])
+            self.caption = settings["title"]
+        if settings["icon"] and settings["icon"] is not self.icon:
+            pg.display.set_icon(settings["icon"])
+            self.icon = settings["icon"]
 
         self.screen = pg.display.get_surface()
+        self.full_present = True
 
     def get_scene_screen(self):
         return pg.Surface(self.scene.settings["size"])
 
     def draw(self):
-        self.screen.blit(pg.transform.scale(self.scene.draw(), self.scene.settings["scale"]), (0, 0))
+        """
+        presents the scene's frame: only its dirty rects when the scale is a whole number, otherwise the whole
+        frame, which always goes through the generic pg.transform.scale path whatever the factor
+        """
+        frame = self.scene.draw()
+        if self.overlay:
+            frame = self.draw_overlay(frame)
+            self.full_present = True
+        mode = self.present_mode
+        # partial presents are only exact when every scene pixel maps onto a whole block of window pixels
+        if self.scene.dirty_rects is not None and not self.full_present and \
+                (mode == "scaled" or self.integer_scale is not None):
+            pg.display.update(self.present_rects(frame, self.scene.dirty_rects))
+            return
+
+        if mode == "scaled":
+            self.screen.blit(frame, (0, 0))
+        elif mode == "blit":
+            self.screen.blit(pg.transform.scale(frame, self.scene.settings["scale"]), (0, 0))
+        else:
+            # the same path at any factor: scaling straight into the display beats scale_by plus a blit, and
+            # scale2x smooths edges instead of repeating pixels
+            pg.transform.scale(frame, self.scene.settings["scale"], self.screen)
         pg.display.update()
+        self.full_present = False
+
+    def draw_overlay(self, frame: pg.Surface) -> pg.Surface:
+        """
+        copy of the scene frame with frame timing stats on top, the scene keeps its own frame untouched
+        """
+        if self.overlay_font is None:
+            self.overlay_font = sp_sh.load_sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 1)
+        if not self.overlay_text or self.frame % self.overlay_interval == 0:
+            self.overlay_text = "\n".join(self.profiler.format(type(self.scene).__name__) +
+                                          (["capturing profile"] if self.profiler.capturing else []))
+            self.overlay_rect = self.scene.measure_text(self.overlay_text, self.overlay_style, self.overlay_font,
+                                                        (2, 2))
+        frame = frame.copy()
+        frame.fill((0, 0, 0), (0, 0, self.overlay_rect.right + 2, self.overlay_rect.bottom + 1))
+        self.scene.render_text(frame, self.overlay_text, (2, 2), self.overlay_style, self.overlay_font)
+        return frame
+
+    @property
+    def integer_scale(self) -> Optional[Tuple[int, int]]:
+        scale_x, scale_y = self.scene_scale
+        if scale_x == int(scale_x) and scale_y == int(scale_y):
+            return int(scale_x), int(scale_y)
+        return None
+
+    def present_rects(self, frame: pg.Surface, rects: List[pg.Rect]) -> List[pg.Rect]:
+        """
+        scales only the dirty parts of ``frame`` into the display, the window rects to update
+
+        Needs an ``integer_scale``, that's what makes every region land on the same window pixels a full present
+        would give it. It isn't a faster scaler, each region goes through the same pg.transform.scale.
+        """
+        scale_x, scale_y = self.integer_scale
+        bounds = frame.get_rect()
+        presented = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if not rect.w or not rect.h:
+                continue
+            if self.present_mode == "scaled":
+                self.screen.blit(frame, rect, rect)
+                presented.append(rect)
+                continue
+            target = pg.Rect(rect.x * scale_x, rect.y * scale_y, rect.w * scale_x, rect.h * scale_y)
+            pg.transform.scale(frame.subsurface(rect), target.size, self.screen.subsurface(target))
+            presented.append(target)
+        return presented
+
+    @property
+    def recording(self) -> bool:
+        return self.recorder is not None and self._scene is self.recorded
+
+    def record_initialize(self):
+        if self.record_path and self.recorder is None and isinstance(self._scene, Game):
+            self.recorded = self._scene
+            self.recorder = InputLogWriter(open(self.record_path, "wb"), self.recorded.seed,
+                                           type(self.recorded).__name__,
+                                           sorted(set(self.recorded.key_bindings.values())))
+            logger.info(f"recording {type(self.recorded).__name__} input to {self.record_path}")
+        if self.recording:
+            self.recorder.initialize()
 
     def update(self):
-        self.scene.update()
+        scene = self.scene
+        scene.update()
+        if self.recorder is not None and scene is self.recorded:
+            self.recorder.tick(scene.checksum())
 
     def run(self):
-        self.bgm.play(-1)
+        sounds.play_music(self.music)
         self.done = False
-        self._scene.initialize()
+        with self.startup.phase("scene initialize"):
+            self._scene.initialize()
+            self.record_initialize()
+        try:
+            self.loop()
+        finally:
+            if self.recorder is not None:
+                self.recorder.close()
+            if self.profiler.frames:
+                logger.info(self.profiler.report())
+            if self.logs.dropped:
+                logger.warning(f"{self.logs.dropped} log records dropped, log writer fell behind")
+            self.logs.stop()
+
+    def loop(self):
+        """
+        fixed timestep loop: real time is paid out in ``1 / tick_rate`` ticks of input and update, then one frame
+        is drawn between the last two ticks, so slow frames are dropped and not ticks
+        """
+        profiler = self.profiler
+        step = 1 / self.tick_rate
+        # the first frame runs one tick before drawing
+        lag = step
+        last = time.perf_counter()
         while not self.done:
-            self.update()
-            self.draw()
+            profiler.start(type(self._scene).__name__)
             self.handle_events()
-            self.handle_input()
+            profiler.lap("events")
+            now = time.perf_counter()
+            lag = min(lag + now - last, step * self.max_ticks_per_frame)
+            last = now
+            self.ticks = 0
+            while lag >= step and not self.done:
+                self.handle_input()
+                profiler.lap("input")
+                self.update()
+                lag -= step
+                self.ticks += 1
+                profiler.lap("update")
+            self.scene.alpha = lag / step
+            self.draw()
+            profiler.lap("draw")
+            if not self.startup.finished:
+                self.startup.finish()
+                logger.info(self.startup.format())
+            elif self.prewarm_queue:
+                self.prewarm()
+            profiler.lap("prewarm")
             self.clock.tick(self.fps)
+            profiler.lap("tick")
+            captured = profiler.end()
+            if captured is not None:
+                self.save_capture(captured)
+            self.log_frame()
+
+    def save_capture(self, stats):
+        path = os.path.join(self.log_dir, f"pong.{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        stats.dump_stats(path)
+        logger.info(f"profile of {self.capture_frames} frames saved to {path}\n{summarize(stats)}")
+
+    def log_frame(self):
+        self.frame += 1
+        if frame_logger.isEnabledFor(logging.INFO):
+            frame_logger.info("frame", extra={"frame": {
+                "frame": self.frame, "scene": type(self._scene).__name__, "ms": self.clock.get_time(),
+                "busy_ms": self.clock.get_rawtime(), "ticks": self.ticks, "phases": self.profiler.phase_ms(),
+                "dropped": self.logs.dropped}})
 
     def handle_events(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.done = True
                 break
+            if event.type == pg.KEYDOWN and event.key in (self.overlay_key, self.capture_key):
+                self.handle_debug_key(event.key)
+                continue
             if "events_filter" not in self.scene.settings or event.type in self.scene.settings["events_filter"]:
+                if self.recording:
+                    self.record_event(event)
                 self.scene.handle_event(event)
 
+    def record_event(self, event):
+        if event.type in (pg.KEYDOWN, pg.KEYUP):
+            self.recorder.key_event(event.type, event.key)
+        elif event.type in (pg.MOUSEBUTTONDOWN, pg.MOUSEBUTTONUP):
+            self.recorder.mouse_event(event.type, event.button, event.pos)
+
+    def handle_debug_key(self, key: int):
+        if key == self.overlay_key:
+            self.overlay = not self.overlay
+            self.overlay_text = ""
+            self.full_present = True
+        elif not self.profiler.capturing:
+            self.profiler.capture(self.capture_frames)
+            logger.info(f"capturing a profile of the next {self.capture_frames} frames")
+
     def handle_input(self):
         self.handle_mouse_press()
         keys_pressed = pg.key.get_pressed()
-        for keycode in self.all_keycodes:
+        for keycode in tuple(self.scene.key_bindings):
             if keys_pressed[keycode]:
+                if self.recording and keycode in self.scene.key_bindings:
+                    self.recorder.action(self.scene.key_bindings[keycode])
                 self.scene.handle_input(keycode)
 
     def handle_mouse_press(self):
@@ -108,188 +400,458 @@ class App:
         mouse_pos = self.get_mouse_pos()
         for key in range(3):
             if pressed[key]:
+                if self.recording:
+                    self.recorder.mouse_press(key, mouse_pos)
                 self.scene.handle_mouse_press(key, mouse_pos)
 
     def get_mouse_pos(self):
         return pg.mouse.get_pos()[0] // self.scene_scale[0], pg.mouse.get_pos()[1] // self.scene_scale[1]
 
 
-class Player(pg.sprite.Sprite):
+class Body:
+    """
+    slotted physics state of a paddle or ball
+
+    Position and velocity are plain floats. ``hit_box`` and ``rect`` are updated in place by ``sync`` whenever the
+    position changes, so the physics loop reads them without building new rects or vectors. ``prev_x`` and
+    ``prev_y`` hold the position at the start of the current tick, frames are drawn between the two.
+    """
+    __slots__ = ("x", "y", "vx", "vy", "prev_x", "prev_y", "offset_x", "offset_y", "hit_box", "rect")
+
+    def __init__(self, pos: pg.Vector2, vel: pg.Vector2, hit_box: pg.Rect, size: Tuple[int, int]):
+        self.x, self.y = pos
+        self.prev_x, self.prev_y = self.x, self.y
+        self.vx, self.vy = vel
+        self.offset_x, self.offset_y = hit_box.x, hit_box.y
+        self.hit_box = pg.Rect(0, 0, hit_box.w, hit_box.h)
+        self.rect = pg.Rect(0, 0, *size)
+        self.sync()
+
+    def sync(self):
+        # pg.Rect truncates float positions, so do the same
+        self.hit_box.x = int(self.x + self.offset_x)
+        self.hit_box.y = int(self.y + self.offset_y)
+        self.rect.x = int(self.x)
+        self.rect.y = int(self.y)
+
+    def move(self, dx: float, dy: float):
+        self.x += dx
+        self.y += dy
+        self.sync()
+
+    def snapshot(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+
+class PlayerBody(Body):
+    __slots__ = ("last_press",)
+
+    def __init__(self, pos: pg.Vector2, vel: pg.Vector2, hit_box: pg.Rect, size: Tuple[int, int]):
+        super().__init__(pos, vel, hit_box, size)
+        self.last_press = 0
+
+
+class BallBody(Body):
+    __slots__ = ("bounce_elapse", "pads_bounce_elapse")
+
+    def __init__(self, pos: pg.Vector2, vel: pg.Vector2, hit_box: pg.Rect, size: Tuple[int, int]):
+        super().__init__(pos, vel, hit_box, size)
+        self.bounce_elapse = 0
+        self.pads_bounce_elapse = 0
+
+
+class BodySprite(pg.sprite.Sprite):
+    """
+    sprite drawn from a Body, ``pos`` and ``vel`` are copies, assign them to move the body
+    """
+    body: Body
+
+    @property
+    def pos(self) -> pg.Vector2:
+        return pg.Vector2(self.body.x, self.body.y)
+
+    @pos.setter
+    def pos(self, value: pg.Vector2):
+        self.body.x, self.body.y = value
+        self.body.sync()
+
+    @property
+    def vel(self) -> pg.Vector2:
+        return pg.Vector2(self.body.vx, self.body.vy)
+
+    @vel.setter
+    def vel(self, value: pg.Vector2):
+        self.body.vx, self.body.vy = value
+
+    @property
+    def hit_box_offset(self) -> pg.Vector2:
+        return pg.Vector2(self.body.offset_x, self.body.offset_y)
+
+    @property
+    def hit_box(self) -> pg.Rect:
+        return self.body.hit_box
+
+    @property
+    def rect(self) -> pg.Rect:
+        return self.body.rect
+
+    def draw_rect(self, alpha: float = 1) -> pg.Rect:
+        """
+        where to draw the sprite ``alpha`` of the way from the previous tick's position to the current one
+        """
+        body = self.body
+        if alpha >= 1:
+            return body.rect.copy()
+        return pg.Rect(int(body.prev_x + (body.x - body.prev_x) * alpha),
+                       int(body.prev_y + (body.y - body.prev_y) * alpha), body.rect.w, body.rect.h)
+
+
+class Player(BodySprite):
     friction = 0.9
     up_force = pg.Vector2(y=-10)
     down_force = pg.Vector2(y=10)
 
     def __init__(self, pos: pg.Vector2, hit_box: pg.Rect, image: pg.Surface, walls: pg.Rect, control_delay: int):
         super().__init__()
-        self.pos = pos
-        self.vel = pg.Vector2()
-        self._hit_box = hit_box
-        self.hit_box_offset = pg.Vector2(hit_box.x, hit_box.y)
         self.image = image
         self.size = self.image.get_size()
+        self.body = PlayerBody(pos, pg.Vector2(), hit_box, self.size)
         self.walls = walls
         self.control_delay = control_delay
-        self.last_press = 0
         self.move_buffer = 0
         self.ball_bounce = pg.Vector2(-1, 1)
+        # positions at each tick of the last update over more than one tick
+        self.trail: List[Tuple[float, float]] = []
 
     @property
-    def hit_box(self):
-        return pg.Rect(*(self.pos + self.hit_box_offset), self._hit_box.w, self._hit_box.h)
+    def last_press(self) -> int:
+        return self.body.last_press
 
-    @property
-    def rect(self):
-        return pg.Rect(*self.pos, *self.size)
+    @last_press.setter
+    def last_press(self, value: int):
+        self.body.last_press = value
 
     def update(self, *args, **kwargs) -> None:
-        self.pos += self.vel
-        self.vel *= self.friction
-
-        self.clamp_pos()
+        body = self.body
+        ticks = kwargs.get("ticks", 1)
+        if ticks == 1:
+            body.move(body.vx, body.vy)
+            body.vx *= self.friction
+            body.vy *= self.friction
+
+            self.clamp_pos()
+        else:
+            # friction and the walls act every tick, so a longer step still moves tick by tick
+            self.trail = [(body.x, body.y)]
+            for _ in range(ticks):
+                body.move(body.vx, body.vy)
+                body.vx *= self.friction
+                body.vy *= self.friction
+                self.clamp_pos()
+                self.trail.append((body.x, body.y))
+
+        if body.last_press > 0:
+            body.last_press = max(0, body.last_press - ticks)
 
-        if self.last_press > 0:
-            self.last_press -= 1
+    @property
+    def reach(self) -> pg.Rect:
+        """
+        hit box covering everywhere the paddle went since the last snapshot, it only moves one way in an update
+        """
+        body, hit_box = self.body, self.body.hit_box
+        return hit_box.union((int(body.prev_x + body.offset_x), int(body.prev_y + body.offset_y), *hit_box.size))
 
     def up(self):
-        self.vel += self.up_force
+        self.body.vx += self.up_force.x
+        self.body.vy += self.up_force.y
 
     def down(self):
-        self.vel += self.down_force
+        self.body.vx += self.down_force.x
+        self.body.vy += self.down_force.y
 
     def control(self, mode: int):
-        if self.last_press:
+        body = self.body
+        if body.last_press:
             self.move_buffer = mode
         else:
             if mode == 1:
                 self.up()
-                self.last_press += self.control_delay
+                body.last_press += self.control_delay
                 self.move_buffer = 0
             elif mode == 2:
                 self.down()
-                self.last_press += self.control_delay
+                body.last_press += self.control_delay
                 self.move_buffer = 0
 
     def clamp_pos(self):
-        if self.hit_box.left < self.walls.left:
-            self.pos.x = self.walls.left + 1
-        if self.hit_box.right > self.walls.right:
-            self.pos.x = self.walls.right - self.hit_box.w - 1
-        if self.hit_box.top < self.walls.top:
-            self.pos.y = self.walls.top + 1
-        if self.hit_box.bottom > self.walls.bottom:
-            self.pos.y = self.walls.bottom - self.hit_box.h - 1
-
-
-class Ball(pg.sprite.Sprite):
+        body, hit_box, walls = self.body, self.body.hit_box, self.walls
+        if hit_box.left < walls.left:
+            body.x = walls.left + 1
+            body.sync()
+        if hit_box.right > walls.right:
+            body.x = walls.right - hit_box.w - 1
+            body.sync()
+        if hit_box.top < walls.top:
+            body.y = walls.top + 1
+            body.sync()
+        if hit_box.bottom > walls.bottom:
+            body.y = walls.bottom - hit_box.h - 1
+            body.sync()
+
+
+class Ball(BodySprite):
     friction = 0.99
     horizontal = pg.Vector2(-1, 1)
     vertical = pg.Vector2(1, -1)
 
+    max_sweeps = 8
+
     def __init__(self, pos: pg.Vector2, vel: pg.Vector2, hit_box: pg.Rect, image: pg.Surface,
                  walls: pg.Rect, bounce_interval: int, pads_bounce_interval: int):
         super().__init__()
-        self.pos = pos
-        self.vel = vel
-        self._hit_box = hit_box
-        self.hit_box_offset = pg.Vector2(hit_box.x, hit_box.y)
         self.image = image
         self.size = self.image.get_size()
+        self.body = BallBody(pos, vel, hit_box, self.size)
         self.walls = walls
         self.bounce_interval = bounce_interval
-        self.bounce_elapse = 0
         self.pads_bounce_interval = pads_bounce_interval
-        self.pads_bounce_elapse = 0
 
     @property
-    def hit_box(self):
-        return pg.Rect(*(self.pos + self.hit_box_offset), self._hit_box.w, self._hit_box.h)
+    def bounce_elapse(self) -> int:
+        return self.body.bounce_elapse
+
+    @bounce_elapse.setter
+    def bounce_elapse(self, value: int):
+        self.body.bounce_elapse = value
 
     @property
-    def rect(self):
-        return pg.Rect(*self.pos, *self.size)
+    def pads_bounce_elapse(self) -> int:
+        return self.body.pads_bounce_elapse
+
+    @pads_bounce_elapse.setter
+    def pads_bounce_elapse(self, value: int):
+        self.body.pads_bounce_elapse = value
 
     def update(self, *args, **kwargs) -> None:
-        self.pos += self.vel
+        body = self.body
+        body.move(body.vx, body.vy)
         self.bounce()
         self.clamp_pos()
 
-        if self.bounce_elapse > 0:
-            self.bounce_elapse -= 1
+        if body.bounce_elapse > 0:
+            body.bounce_elapse -= 1
 
-        if self.pads_bounce_elapse > 0:
-            self.pads_bounce_elapse -= 1
+        if body.pads_bounce_elapse > 0:
+            body.pads_bounce_elapse -= 1
 
+        # contacts are normally delivered by Game.world, the keyword arguments check them directly
         if "pads" in kwargs:
             pads: pg.sprite.Group = kwargs["pads"]
             pad: Player
             for pad in pads:
-                if self.hit_box.colliderect(pad.hit_box) and self.pads_bounce_elapse == 0:
-                    si_x, si_y = multiply_vec(self.vel, pad.ball_bounce)
-                    diff = pg.Vector2(self.hit_box.center) - pg.Vector2(pad.hit_box.center)
-                    if diff.length():
-                        v_x, v_y = diff / diff.length() * 10
-                    else:
-                        v_x, v_y = 8, 6
-                    if v_x == 0:
-                        v_x = 1
-                    self.vel = pg.Vector2(mh.copysign(v_x, si_x), mh.copysign(v_y, si_y))
-                    self.pads_bounce_elapse += self.pads_bounce_interval
+                if body.hit_box.colliderect(pad.hit_box):
+                    self.bounce_off(pad)
 
         if "goals" in kwargs:
             goals: List[BallGoal] = kwargs["goals"]
             for goal in goals:
-                goal.collide(self.hit_box)
+                goal.collide(body.hit_box)
+
+    def on_contact(self, other):
+        if isinstance(other, Player):
+            self.bounce_off(other)
+
+    def bounce_off(self, pad: Player):
+        body = self.body
+        if body.pads_bounce_elapse:
+            return
+        self.deflect(pad, body.hit_box.center, pad.hit_box.center)
+        body.pads_bounce_elapse += self.pads_bounce_interval
+
+    def deflect(self, pad: Player, center: Tuple[float, float], pad_center: Tuple[float, float]):
+        """
+        sends the ball at ``center`` away from the paddle's centre at the ball speed, keeping the vertical direction
+        """
+        body = self.body
+        si_x, si_y = body.vx * pad.ball_bounce.x, body.vy * pad.ball_bounce.y
+        diff_x = center[0] - pad_center[0]
+        diff_y = center[1] - pad_center[1]
+        length = mh.sqrt(diff_x * diff_x + diff_y * diff_y)
+        if length:
+            # the way pg.Vector2 divides, through the reciprocal
+            reciprocal = 1 / length
+            v_x, v_y = diff_x * reciprocal * 10, diff_y * reciprocal * 10
+        else:
+            v_x, v_y = 8, 6
+        if v_x == 0:
+            v_x = 1
+        body.vx, body.vy = mh.copysign(v_x, si_x), mh.copysign(v_y, si_y)
+        sounds.mixer.play("paddle")
+
+    def sweep(self, world: CollisionWorld, ticks: int = 1, start: float = 0.) -> Tuple[float, Optional["BallGoal"]]:
+        """
+        continuous movement from ``start`` to the end of a ``ticks`` ticks step: walls reflect the ball and
+        paddles deflect it at the moment of impact, so it can't tunnel through either at any speed or step, and
+        needs neither cooldowns nor position fix ups. The sweep stops where the ball goes into a goal and returns
+        when and which goal, (ticks, None) when it didn't, its owner scores it.
+        """
+        body = self.body
+        now = start
+        for _ in range(self.max_sweeps):
+            remaining = ticks - now
+            if remaining <= 0:
+                break
+            box = (body.x + body.offset_x, body.y + body.offset_y, body.hit_box.w, body.hit_box.h)
+            delta = body.vx * remaining, body.vy * remaining
+            path = pg.Rect(mh.floor(min(box[0], box[0] + delta[0])), mh.floor(min(box[1], box[1] + delta[1])),
+                           mh.ceil(box[2] + abs(delta[0])) + 1, mh.ceil(box[3] + abs(delta[1])) + 1)
+
+            hit_at, hit, pad_center = 1., None, (0., 0.)
+            for at, axis in self.wall_times(box, delta):
+                if at < hit_at:
+                    hit_at, hit = at, axis
+            for other in world.query(path, ("pad", "goal")):
+                if isinstance(other, BallGoal):
+                    # only going in counts, not being in one already
+                    at = sweep_time(box, delta, other.rect)
+                    if at is not None and at < hit_at and sweep_time(box, (0, 0), other.rect) is None:
+                        hit_at, hit = at, other
+                elif isinstance(other, Player):
+                    contact = self.pad_contact(other, box, now, ticks)
+                    if contact is not None and (contact[0] - now) / remaining < hit_at:
+                        hit_at, hit, pad_center = (contact[0] - now) / remaining, other, contact[1:]
+
+            body.move(hit_at * delta[0], hit_at * delta[1])
+            if hit is None:
+                break
+            now += hit_at * remaining
+            if isinstance(hit, BallGoal):
+                return now, hit
+            if isinstance(hit, Player):
+                self.deflect(hit, (body.x + body.offset_x + box[2] / 2, body.y + body.offset_y + box[3] / 2),
+                             pad_center)
+            else:
+                flip = self.horizontal if hit == 0 else self.vertical
+                body.vx, body.vy = body.vx * flip.x, body.vy * flip.y
+                sounds.mixer.play("wall")
+        return ticks, None
+
+    def pad_contact(self, pad: Player, box: Tuple[float, float, float, float], now: float,
+                    ticks: int) -> Optional[Tuple[float, float, float]]:
+        """
+        (tick of the step, paddle centre x, y) where the ball at ``box`` at ``now`` first meets the paddle, which
+        moved in a line between its positions at each tick of the step. None when it doesn't, or only meets it
+        already past its centre, leaving it
+        """
+        body, pad_body = self.body, pad.body
+        trail = pad.trail if ticks > 1 else ((pad_body.prev_x, pad_body.prev_y), (pad_body.x, pad_body.y))
+        width, height = pad_body.hit_box.size
+        for tick in range(int(now), ticks):
+            (from_x, from_y), (to_x, to_y) = trail[tick], trail[tick + 1]
+            begin = max(float(tick), now)
+            # in the paddle's frame, where it stands still where the tick leaves it
+            still = tick + 1 - begin
+            move_x, move_y = to_x - from_x, to_y - from_y
+            ball = (box[0] + body.vx * (begin - now) + move_x * still,
+                    box[1] + body.vy * (begin - now) + move_y * still, box[2], box[3])
+            target = pg.Rect(int(to_x + pad_body.offset_x), int(to_y + pad_body.offset_y), width, height)
+            at = sweep_time(ball, ((body.vx - move_x) * still, (body.vy - move_y) * still), target)
+            if at is None:
+                continue
+            at = begin + at * still
+            center_x = from_x + move_x * (at - tick) + pad_body.offset_x + width / 2
+            center_y = from_y + move_y * (at - tick) + pad_body.offset_y + height / 2
+            if (center_x - box[0] - box[2] / 2 - body.vx * (at - now)) * body.vx <= 0:
+                return None
+            return at, center_x, center_y
+        return None
+
+    def wall_times(self, box: Tuple[float, float, float, float], delta: Tuple[float, float]):
+        """
+        (fraction of ``delta``, axis) of every wall box moving by delta runs into
+        """
+        for axis, start, size, move, low, high in ((0, box[0], box[2], delta[0], self.walls.left, self.walls.right),
+                                                   (1, box[1], box[3], delta[1], self.walls.top, self.walls.bottom)):
+            if move < 0 and start + move < low:
+                yield max(0.0, (low - start) / move), axis
+            elif move > 0 and start + size + move > high:
+                yield max(0.0, (high - start - size) / move), axis
+
+    def reflect(self, flip: pg.Vector2):
+        body = self.body
+        body.vx, body.vy = body.vx * flip.x, body.vy * flip.y
+        body.move(body.vx, body.vy)
+        body.bounce_elapse += self.bounce_interval
+        sounds.mixer.play("wall")
 
     def bounce(self):
-        if self.bounce_elapse > 0:
+        body, hit_box, walls = self.body, self.body.hit_box, self.walls
+        if body.bounce_elapse > 0:
             return
-        if self.hit_box.left < self.walls.left:
-            self.vel = multiply_vec(self.vel, self.horizontal)
-            self.pos += self.vel
-            self.bounce_elapse += self.bounce_interval
-        if self.hit_box.right > self.walls.right:
-            self.vel = multiply_vec(self.vel, self.horizontal)
-            self.pos += self.vel
-            self.bounce_elapse += self.bounce_interval
-        if self.hit_box.top < self.walls.top:
-            self.vel = multiply_vec(self.vel, self.vertical)
-            self.pos += self.vel
-            self.bounce_elapse += self.bounce_interval
-        if self.hit_box.bottom > self.walls.bottom:
-            self.vel = multiply_vec(self.vel, self.vertical)
-            self.pos += self.vel
-            self.bounce_elapse += self.bounce_interval
+        if hit_box.left < walls.left:
+            self.reflect(self.horizontal)
+        if hit_box.right > walls.right:
+            self.reflect(self.horizontal)
+        if hit_box.top < walls.top:
+            self.reflect(self.vertical)
+        if hit_box.bottom > walls.bottom:
+            self.reflect(self.vertical)
 
     def clamp_pos(self):
-        if self.hit_box.left < self.walls.left:
-            self.pos.x = self.walls.left + 21
-        if self.hit_box.right > self.walls.right:
-            self.pos.x = self.walls.right + self.hit_box.w
-        if self.hit_box.top < self.walls.top:
-            self.pos.y = self.walls.top + self.vel.y
-        if self.hit_box.bottom > self.walls.bottom:
-            self.pos.y = self.walls.bottom + self.hit_box.h
+        body, hit_box, walls = self.body, self.body.hit_box, self.walls
+        if hit_box.left < walls.left:
+            body.x = walls.left + 21
+            body.sync()
+        if hit_box.right > walls.right:
+            body.x = walls.right + hit_box.w
+            body.sync()
+        if hit_box.top < walls.top:
+            body.y = walls.top + body.vy
+            body.sync()
+        if hit_box.bottom > walls.bottom:
+            body.y = walls.bottom + hit_box.h
+            body.sync()
 
 
 class BallGoal:
-    def __init__(self, rect: pg.Rect, on_collide: Callable):
+    """
+    scoring area, ``on_collide`` returns whether the contact scored
+    """
+
+    def __init__(self, rect: pg.Rect, on_collide: Callable[[], bool]):
         self.rect = rect
         self.on_collide = on_collide
 
     def collide(self, other: pg.Rect):
         if self.rect.colliderect(other):
-            self.on_collide()
+            self.on_contact(other)
+
+    def on_contact(self, _):
+        if self.on_collide():
+            sounds.mixer.play("score")
 
 
 class Scene:
     app = None
+    text_cache = TextCache(256)
     settings = {"size": (0, 0), "scale": (0, 0), "title": "", "icon": None}
     settings["icon"]: Optional[pg.Surface]
+    # held keys polled every tick, keycode -> action passed to handle_action
+    key_bindings: Dict[int, str] = {}
+    # how far the next tick is when drawing, set by App before each draw
+    alpha = 1.
 
-    def __init__(self, app):
+    def __init__(self, app, seed: Optional[int] = None):
         self.app = self.app or app
+        self.key_bindings = dict(self.key_bindings)
+        # gameplay randomness comes from the scene's own generator, so a seed reproduces a match
+        self.seed = rd.getrandbits(63) if seed is None else seed
+        self.rng = rd.Random(self.seed)
         self.initialized = False
         self.font: sp_sh.SpriteSheet = ...
+        # regions of the returned frame changed by the last draw, None when the whole frame changed
+        self.dirty_rects: Optional[List[pg.Rect]] = None
 
     def draw(self) -> pg.Surface:
         pass
@@ -298,14 +860,40 @@ class Scene:
         pass
 
     def handle_input(self, k_id: int):
+        action = self.key_bindings.get(k_id)
+        if action is not None:
+            self.handle_action(action)
+
+    def handle_action(self, action: str):
         pass
 
+    def bind_key(self, keycode: int, action: str):
+        self.key_bindings[keycode] = action
+
+    def unbind_key(self, keycode: int):
+        self.key_bindings.pop(keycode, None)
+
+    def rebind_action(self, action: str, keycodes: List[int]):
+        for keycode in [key for key, bound in self.key_bindings.items() if bound == action]:
+            del self.key_bindings[keycode]
+        for keycode in keycodes:
+            self.key_bindings[keycode] = action
+
     def handle_mouse_press(self, key: int, pos: Tuple[int, int]):
         pass
 
     def handle_event(self, event):
         pass
 
+    def scene_screen(self) -> pg.Surface:
+        """
+        the scene's surface, allocated on first use and kept across transitions while the size stays the same
+        """
+        screen = getattr(self, "screen", None)
+        if not isinstance(screen, pg.Surface) or screen.get_size() != tuple(self.settings["size"]):
+            screen = self.app.get_scene_screen()
+        return screen
+
     def init(self):
         if not self.initialized:
             self.initialize()
@@ -314,47 +902,43 @@ class Scene:
     def initialize(self):
         pass
 
-    def render_text(self, surface: pg.Surface, text: Union[List[str], str], pos: Tuple[int, int], right_offset: int,
-                    down_offset: int, font: Optional[sp_sh.SpriteSheet] = None, calculate_offset: bool = False,
-                    space_offset: int = 0, enter_offset: int = 0):
-        text += "\n"
+    def render_text(self, surface: pg.Surface, text: Union[List[str], str], pos: Tuple[int, int], style: TextStyle,
+                    font: Optional[sp_sh.SpriteSheet] = None) -> pg.Rect:
         font = font or self.font
-        cur_pos = pos
-        last_letter: Optional[pg.Surface] = None
-        biggest_width = 0
-        for letter in text:
-            if letter == "\n":
-                if biggest_width < cur_pos[0]:
-                    biggest_width = cur_pos[0]
-                if calculate_offset:
-                    cur_pos = pos[0], cur_pos[1] + (enter_offset if not last_letter else last_letter.get_height()) \
-                              + down_offset
-                else:
-                    cur_pos = pos[0], cur_pos[1] + down_offset
+        key = (text if isinstance(text, str) else tuple(text), font, style)
+        run = self.text_cache.get(key)
+        if run is None:
+            run = self.text_cache.put(key, self.build_text_run(layout_text(text, font.metrics, style), font))
+        surface.blit(run.image, (pos[0] + run.bounds.x, pos[1] + run.bounds.y))
+        return run.rect.move(pos)
+
+    def measure_text(self, text: Union[List[str], str], style: TextStyle, font: Optional[sp_sh.SpriteSheet] = None,
+                     pos: Tuple[int, int] = (0, 0)) -> pg.Rect:
+        """
+        the rect render_text would return, laid out from glyph metrics without drawing or cutting glyphs
+        """
+        return layout_text(text, (font or self.font).metrics, style).rect.move(pos)
 
-            elif letter == " ":
-                if calculate_offset:
-                    cur_pos = cur_pos[0] + (space_offset if not last_letter else last_letter.get_width()), cur_pos[1]
-                else:
-                    cur_pos = cur_pos[0] + right_offset, cur_pos[1]
-            else:
-                last_letter = font.get(letter)
-                surface.blit(last_letter, cur_pos)
-                if calculate_offset:
-                    cur_pos = cur_pos[0] + last_letter.get_width() + right_offset, cur_pos[1]
-                else:
-                    cur_pos = cur_pos[0] + right_offset, cur_pos[1]
-        width = biggest_width - pos[0]
-        height = cur_pos[1] - pos[1]
-        return pg.Rect(pos, (width, height))
+    @staticmethod
+    def build_text_run(layout: Layout, font: sp_sh.SpriteSheet) -> TextRun:
+        image = pg.Surface(layout.bounds.size, pg.SRCALPHA)
+        # glyphs are copied as they are, so the run blends exactly like per-glyph blits
+        draw_layout(image, layout, font, (-layout.bounds.x, -layout.bounds.y), pg.BLEND_RGBA_MAX)
+        return TextRun(image, layout.bounds, layout.rect)
 
 
 class Game(Scene):
     settings = {"size": (512, 256), "scale": (1024, 512), "title": "Pong Game", "icon": None,
-                "events_filter": {pg.MOUSEBUTTONDOWN, pg.KEYDOWN, pg.KEYUP}}
-
-    def __init__(self, app: App):
-        super(Game, self).__init__(app)
+                "events_filter": {pg.MOUSEBUTTONDOWN, pg.KEYDOWN, pg.KEYUP}, "dirty_rects": False,
+                "present": "scale"}
+    key_bindings = {pg.K_w: "up", pg.K_s: "down"}
+    # InterceptBot level of the built-in bot, None chases the ball's centre every tick. Chasing stays the default,
+    # no level plays like it yet, and BatchSimulation mirrors only the chasing bot
+    bot_level: Optional[str] = None
+    score_style = TextStyle(8)
+
+    def __init__(self, app: App, seed: Optional[int] = None):
+        super(Game, self).__init__(app, seed)
         self.pl_img = pg.Surface((10, 50), pg.SRCALPHA)
         self.pl_img.fill((255, 255, 255))
 
@@ -364,9 +948,16 @@ class Game(Scene):
         self.bl_img = pg.Surface((10, 10), pg.SRCALPHA)
         pg.draw.circle(self.bl_img, (255, 255, 255), (5, 5), 5)
         self.bounds = pg.Rect(20, 15, 482, 221)
+        self.world = CollisionWorld()
+        # continuous collision, the ball can't pass through a paddle or wall at any speed
+        self.swept_collision = False
         self.player = Player(pg.Vector2(30, 128), pg.Rect(0, 0, 10, 50), self.pl_img, self.bounds, 10)
         self.bot = Player(pg.Vector2(472, 128), pg.Rect(0, 0, 10, 50), self.pl_img, self.bounds, 10)
+        for pad in (self.player, self.bot):
+            # a swept ball looks for paddles everywhere they went in the update
+            self.world.add(pad, lambda pad=pad: pad.reach if self.swept_collision else pad.hit_box, "pad")
         self.ball: Ball = ...
+        self.ball_collider: Optional[Collider] = None
         self.max_bounds = pg.Rect(self.bounds.x - 20, self.bounds.y - 20, self.bounds.width + 20,
                                   self.bounds.height + 20)
         self.players_group = pg.sprite.Group(self.player, self.bot)
@@ -374,10 +965,19 @@ class Game(Scene):
         self.left_goal = BallGoal(pg.Rect(20, 0, 10, 256), self.left_collide)
         self.right_goal = BallGoal(pg.Rect(492, 0, 10, 256), self.right_collide)
         self.goals = [self.left_goal, self.right_goal]
+        for goal in self.goals:
+            self.world.add(goal, lambda goal=goal: goal.rect, "goal", on_contact=goal.on_contact, static=True)
         self.player_score = 0
         self.bot_score = 0
         self.scoring_delay = 10
         self.scoring_elapse = 0
+        self.auto_bot = True
+        self.intercept: Optional[InterceptBot] = None
+        self.set_bot_level(self.bot_level)
+        # ticks simulated per update, a fraction carries to the next update. The discrete ball steps them one by one,
+        # the swept one covers the whole ticks of an update in a single step
+        self.time_scale = 1
+        self.pending_ticks = 0.
         self.respawn_ball()
         self.sheet = sp_sh.load_sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 6)
         self.background = pg.Surface(self.settings["size"])
@@ -402,17 +1002,45 @@ class Game(Scene):
 
         self.title = "pong"
 
+        self.full_redraw = True
+        self.drawn_rects: List[pg.Rect] = []
+        self.drawn_score_rects: List[pg.Rect] = []
+        self.drawn_scores: Tuple[int, int] = (0, 0)
+
     def draw(self):
-        self.screen.fill((0, 0, 0))
-        self.screen.blit(self.background, (0, 0))
-        self.players_group.draw(self.screen)
-        self.balls_group.draw(self.screen)
-        self.draw_text(self.screen)
+        partial = self.settings.get("dirty_rects") and not self.full_redraw
+        if not partial:
+            self.screen.fill((0, 0, 0))
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.drawn_rects + self.drawn_score_rects:
+                self.screen.blit(self.background, rect, rect)
+
+        drawn_rects = [sprite.draw_rect(self.alpha) for sprite in (*self.players_group, *self.balls_group)]
+        for sprite, rect in zip((*self.players_group, *self.balls_group), drawn_rects):
+            self.screen.blit(sprite.image, rect)
+        score_rects = self.draw_text(self.screen)
+        drawn_rects += self.draw_overlay(self.screen)
+
+        if not partial:
+            self.dirty_rects = None
+            self.full_redraw = False
+        else:
+            self.dirty_rects = self.drawn_rects + drawn_rects
+            if self.drawn_scores != (self.player_score, self.bot_score) or self.drawn_score_rects != score_rects:
+                self.dirty_rects += self.drawn_score_rects + score_rects
+        self.drawn_rects = drawn_rects
+        self.drawn_score_rects = score_rects
+        self.drawn_scores = self.player_score, self.bot_score
         return self.screen
 
+    def draw_overlay(self, surface: pg.Surface) -> List[pg.Rect]:
+        return []
+
     def initialize(self):
+        self.full_redraw = True
         self.sheet.generate()
-        self.screen = self.app.get_scene_screen()
+        self.screen = self.scene_screen()
         self.settings["icon"] = self.sheet.get("logo")
         self.app.update_screen()
 
@@ -423,29 +1051,23 @@ class Game(Scene):
         reset_pos = reset_pos if reset_pos else (256, 30) if back else self.pl_score_rect.topleft
         reset_pos2 = reset_pos2 if reset_pos2 else (256, 30) if back else self.bt_score_rect.topleft
 
-        self.pl_score_rect.topleft = reset_pos
-        self.pl_score_rect = self.render_text(self.screen, str(self.player_score), self.pl_score_rect.topleft, 8, 0,
-                                              self.sheet, True)
+        self.pl_score_rect = self.measure_text(str(self.player_score), self.score_style, self.sheet, reset_pos)
 
         if back:
             # noinspection SpellCheckingInspection
             self.pl_score_rect.topleft = (self.pl_score_rect.x - self.pl_score_rect.w - 30, self.pl_score_rect.y)
 
-        self.bt_score_rect.topleft = reset_pos2
-        self.bt_score_rect = self.render_text(self.screen, str(self.player_score), self.bt_score_rect.topleft, 8, 0,
-                                              self.sheet, True)
+        self.bt_score_rect = self.measure_text(str(self.player_score), self.score_style, self.sheet, reset_pos2)
 
         if back:
             # noinspection SpellCheckingInspection
             self.bt_score_rect.topleft = (self.bt_score_rect.x + 38, self.bt_score_rect.y)
 
-    def draw_text(self, surface: pg.Surface):
-        self.render_text(surface, str(self.player_score), self.pl_score_rect.topleft, 8, 0,
-                         self.sheet, True)
-
-        self.render_text(surface, str(self.bot_score), self.bt_score_rect.topleft, 8, 0,
-                         self.sheet, True)
-        return
+    def draw_text(self, surface: pg.Surface) -> List[pg.Rect]:
+        return [self.render_text(surface, str(self.player_score), self.pl_score_rect.topleft, self.score_style,
+                                 self.sheet),
+                self.render_text(surface, str(self.bot_score), self.bt_score_rect.topleft, self.score_style,
+                                 self.sheet)]
 
         # pl_score_len = len(str(self.player_score)) * self.sheet.scale * 4
         # # noinspection PyUnusedLocal
@@ -463,8 +1085,10 @@ class Game(Scene):
     def respawn_ball(self):
         if isinstance(self.ball, Ball):
             self.ball.kill()
+        if self.ball_collider:
+            self.world.remove(self.ball_collider)
 
-        ball_vec = pg.Vector2(rd.random() * 20 - 10, rd.random() * 20 - 10)
+        ball_vec = pg.Vector2(self.rng.random() * 20 - 10, self.rng.random() * 20 - 10)
         ball_vec_l = ball_vec.length()
         if ball_vec_l and ball_vec.x:
             ball_vec = ball_vec / ball_vec_l * 10
@@ -473,36 +1097,89 @@ class Game(Scene):
 
         self.ball = Ball(pg.Vector2(256, 128), ball_vec, pg.Rect(0, 0, 10, 10), self.bl_img, self.bounds, 0, 5)
         self.ball.add(self.balls_group)
+        ball = self.ball
+        # a swept ball resolves its paddle and goal contacts while moving
+        self.ball_collider = self.world.add(ball, lambda: ball.hit_box, "ball",
+                                            () if self.swept_collision else ("pad", "goal"), ball.on_contact)
 
     def update(self):
+        for sprite in (*self.players_group, *self.balls_group):
+            sprite.body.snapshot()
+        self.pending_ticks += self.time_scale
+        ticks = int(self.pending_ticks)
+        self.pending_ticks -= ticks
+        if self.swept_collision:
+            if ticks:
+                self.advance(ticks)
+        else:
+            for _ in range(ticks):
+                self.advance()
+
+        if self.left_side.contains(self.bt_score_rect) and self.right_side.contains(self.pl_score_rect):
+            raise RuntimeError("Do not fake your score!")
+
+    def advance(self, ticks: int = 1):
+        """
+        ``ticks`` ticks of the match, more than one only for the swept ball: paddles still move tick by tick, the
+        ball sweeps the whole step against their trail, and the bot and the timers catch up once after it
+        """
         if not self.max_bounds.contains(self.ball.hit_box):
             self.respawn_ball()
-        self.players_group.update()
-        self.balls_group.update(pads=self.players_group, goals=self.goals)
+        self.players_group.update(ticks=ticks)
+        # ticks the scoring delay has already counted down
+        counted = 0
+        if self.swept_collision:
+            self.world.refresh()
+            # the walls keep a swept ball in, it's served again the moment it goes into a goal
+            now, goal = self.ball.sweep(self.world, ticks)
+            while goal is not None:
+                # the delay runs down to the goal's tick first, so goals score as they would tick by tick
+                self.scoring_elapse = max(0, self.scoring_elapse - (int(now) - counted))
+                counted = int(now)
+                goal.on_contact(self.ball)
+                self.respawn_ball()
+                now, goal = self.ball.sweep(self.world, ticks, now)
+        else:
+            self.balls_group.update()
+            self.world.step()
 
         # bot control
-        self.control_bot()
+        if self.auto_bot:
+            self.control_bot(ticks)
 
         if self.scoring_elapse > 0:
-            self.scoring_elapse -= 1
-
-        if self.left_side.contains(self.bt_score_rect) and self.right_side.contains(self.pl_score_rect):
-            raise RuntimeError("Do not fake your score!")
-
-    def control_bot(self):
+            self.scoring_elapse = max(0, self.scoring_elapse - (ticks - counted))
+
+    def checksum(self) -> int:
+        """
+        crc32 of the simulated state, replays compare it tick by tick
+        """
+        ints = [self.player_score, self.bot_score, self.scoring_elapse, self.player.body.last_press,
+                self.bot.body.last_press, self.ball.body.bounce_elapse, self.ball.body.pads_bounce_elapse]
+        floats = [value for body in (self.player.body, self.bot.body, self.ball.body)
+                  for value in (body.x, body.y, body.vx, body.vy)]
+        return zlib.crc32(struct.pack(f"<{len(ints)}q{len(floats)}d", *ints, *floats))
+
+    def set_bot_level(self, level: Optional[str]):
+        # aim noise has its own generator, so the ball's serves don't depend on the bot
+        self.intercept = InterceptBot(level, rd.Random(self.seed ^ 0xB07)) if level else None
+
+    def control_bot(self, ticks: int = 1):
+        if self.intercept is not None:
+            mode = self.intercept.control(self.bot, self.ball, ticks)
+            if mode:
+                self.bot.control(mode)
+            return
         if self.bot.hit_box.centery > self.ball.hit_box.centery:
             self.bot.control(1)
         if self.bot.hit_box.centery < self.ball.hit_box.centery:
             self.bot.control(2)
 
-    def handle_input(self, k_id: int):
-        with switch(k_id):
-            # noinspection PyCallingNonCallable
-            if case(pg.K_w):
-                self.player.control(1)
-            # noinspection PyCallingNonCallable
-            if case(pg.K_s):
-                self.player.control(2)
+    def handle_action(self, action: str):
+        if action == "up":
+            self.player.control(1)
+        elif action == "down":
+            self.player.control(2)
 
     def handle_mouse_press(self, key: int, pos: Tuple[int, int]):
         if key == 0:
@@ -517,22 +1194,27 @@ class Game(Scene):
                                               pg.Vector2(self.bt_score_rect.topleft)),)
                 self.generate_score_pos(reset_pos2=fix_pos, back=False)
 
-    def left_collide(self):
+    def left_collide(self) -> bool:
         if self.scoring_elapse:
-            return
+            return False
         self.bot_score += 1
         self.scoring_elapse += self.scoring_delay
+        return True
 
-    def right_collide(self):
+    def right_collide(self) -> bool:
         if self.scoring_elapse:
-            return
+            return False
         self.player_score += 1
         self.scoring_elapse += self.scoring_delay
+        return True
 
 
 class Menu(Scene):
     settings = {"size": (512, 256), "scale": (1024, 512), "title": "Pong Menu", "icon": None,
-                "events_filter": {pg.MOUSEBUTTONDOWN, pg.KEYDOWN, pg.KEYUP}}
+                "events_filter": {pg.MOUSEBUTTONDOWN, pg.KEYDOWN, pg.KEYUP}, "present": "scale"}
+    option_style = TextStyle(8)
+    credit_style = TextStyle(2)
+    description_style = TextStyle(6, 2)
 
     def __init__(self, app):
         super(Menu, self).__init__(app)
@@ -553,7 +1235,7 @@ class Menu(Scene):
     def initialize(self):
         self.font.generate()
         self.small_font.generate()
-        self.screen = self.app.get_scene_screen()
+        self.screen = self.scene_screen()
         self.settings["icon"] = self.font.get("logo")
         self.app.update_screen()
 
@@ -565,24 +1247,25 @@ class Menu(Scene):
             text = "welcome to pong, the game where you need\nto bounce ball and gain score.\n" \
                    "\nrequirements:\n" \
                    "- python 3.8 or higher\n" \
-                   "- pygame\n" \
+                   "- pygame, numpy\n" \
                    "\ndescription:\n" \
                    "this game was made by me and 'mio coder'\nfor summer 2021 pygame game jam\n" \
                    "theme was: remake old game with a twist\n" \
                    "twist for this game:" \
                    "it is possible that we hid\nsome 'secrets'\n" \
                    "to this game"
-            self.render_text(self.screen, text, (0, 0), 6, 2, self.really_small_font, True, 40)
+            self.render_text(self.screen, text, (0, 0), self.description_style, self.really_small_font)
         else:
             if self.epilepsy_warning:
                 self.screen.fill((rd.randint(0, 255), rd.randint(0, 255), rd.randint(0, 255)))
-            self.title_rect = self.render_text(self.screen, self.title, (0, 0), 8, 0, self.font, True, 40)
-            self.play_rect = self.render_text(self.screen, "play", (0, 75), 8, 0, self.small_font, True, 40)
-            self.tutorial_rect = self.render_text(self.screen, "tutorial", (0, 125), 8, 0, self.small_font, True, 40)
-            self.quit_rect = self.render_text(self.screen, "quit", (0, 175), 8, 0, self.small_font, True, 40)
+            self.title_rect = self.render_text(self.screen, self.title, (0, 0), self.option_style, self.font)
+            self.play_rect = self.render_text(self.screen, "play", (0, 75), self.option_style, self.small_font)
+            self.tutorial_rect = self.render_text(self.screen, "tutorial", (0, 125), self.option_style,
+                                                  self.small_font)
+            self.quit_rect = self.render_text(self.screen, "quit", (0, 175), self.option_style, self.small_font)
 
             self.pygame_rect = self.render_text(self.screen, [*list("made with "), ":pygame:", *list("pygame")],
-                                                (325, 225), 2, 0, self.really_small_font, True, 40)
+                                                (325, 225), self.credit_style, self.really_small_font)
 
             if not isinstance(self.option_selected, int):
                 pass
@@ -607,7 +1290,7 @@ class Menu(Scene):
             self.option_selected = 2
 
     def pong_title_easter_egg(self):
-        if rd.randint(0, 5) == 5:
+        if self.rng.randint(0, 5) == 5:
             self.title = "pang"
             self.app.game.title = "pang"
             self.app.tutorial.title = "pang"
@@ -734,6 +1417,7 @@ class TutorialDialogue:
                 self.game.bot.up_force = pg.Vector2(y=-5)
                 self.game.bot.down_force = pg.Vector2(y=5)
                 self.game.bot.control_delay = 2
+                self.game.set_bot_level("hard")
             elif self.game.bot_score >= 10:
                 self.stage = "2.get_long"
         elif self.stage in {"3.1", "3.2", "3.3"}:
@@ -760,13 +1444,16 @@ class TutorialDialogue:
 
 
 class Tutorial(Game):
-    def __init__(self, app):
-        super().__init__(app)
+    dialogue_style = TextStyle(6, 2)
+
+    def __init__(self, app, seed: Optional[int] = None):
+        super().__init__(app, seed)
         self.font = sp_sh.load_sprite_sheet("alphabet.png", "sprite_sheet.json", "box", 2)
         self.dialogue = TutorialDialogue(self)
         self.screen: pg.Surface = ...
-        self.player_bullets: List[pg.Rect] = []
-        self.bot_bullets: List[pg.Rect] = []
+        # bullets of both sides, side 0 hits the player and side 1 the bot
+        self.bullets = BulletPool((5, 5))
+        self.bullet_speed = 5
         self.player_stunned = 0
         self.bot_stunned = 0
         self.player_reload = 0
@@ -780,38 +1467,37 @@ class Tutorial(Game):
         # self.player_score = 3
         # self.bot_score = 7
 
-    @staticmethod
-    def add_bullet(set_to_add: List[pg.Rect], thrower: pg.Rect):
-        bullet = pg.Rect(0, 0, 5, 5)
-        bullet.center = thrower.center
-        set_to_add.append(bullet)
+    def add_bullet(self, thrower: Player, target: Player):
+        speed = self.bullet_speed if target is self.bot else -self.bullet_speed
+        self.bullets.spawn(thrower.rect.center, speed, 1 if target is self.bot else 0)
+        sounds.mixer.play("bullet")
 
     def player_shoot(self):
         if self.player_reload == 0:
-            self.add_bullet(self.player_bullets, self.player.rect)
+            self.add_bullet(self.player, self.bot)
             self.player_reload += self.reload_time
 
     def bot_shoot(self):
         if self.bot_reload == 0:
-            self.add_bullet(self.bot_bullets, self.bot.rect)
+            self.add_bullet(self.bot, self.player)
             self.bot_reload += self.reload_time
 
     def initialize(self):
         super(Tutorial, self).initialize()
         self.font.generate()
-        self.screen = self.app.get_scene_screen()
-        self.settings["icon"] = self.sheet.get("logo")
-        self.app.update_screen()
 
-    def control_bot(self):
+    def checksum(self) -> int:
+        alive = self.bullets.alive
+        state = struct.pack("<4q", self.player_stunned, self.bot_stunned, self.player_reload, self.bot_reload) + \
+            self.dialogue.stage.encode() + self.bullets.x[alive].tobytes() + self.bullets.y[alive].tobytes()
+        return zlib.crc32(state, super(Tutorial, self).checksum())
+
+    def control_bot(self, ticks: int = 1):
         if self.dialogue.stage == "3.3":
             if self.bot.rect.centerx - self.ball.hit_box.centerx <= 255:
                 if self.bot_stunned > 0:
                     return
-                if self.bot.hit_box.centery > self.ball.hit_box.centery:
-                    self.bot.control(1)
-                if self.bot.hit_box.centery < self.ball.hit_box.centery:
-                    self.bot.control(2)
+                super(Tutorial, self).control_bot(ticks)
             # offensive
             else:
                 # defensive
@@ -822,81 +1508,73 @@ class Tutorial(Game):
                     self.bot.control(2)
                     self.bot_shoot()
         else:
-            super(Tutorial, self).control_bot()
+            super(Tutorial, self).control_bot(ticks)
 
     def update(self):
         if self.dialogue.is_paused():
             self.dialogue.generate_dialogues()
         else:
             super(Tutorial, self).update()
-            for pl_b_index in range(len(self.player_bullets)):
-                if self.bot.hit_box.colliderect(self.player_bullets[pl_b_index]):
-                    self.bot_stunned += self.stun_time
-                    self.player_bullets.pop(pl_b_index)
-                    break
-                self.player_bullets[pl_b_index].x += 5
-                if not self.max_bounds.contains(self.player_bullets[pl_b_index]):
-                    self.player_bullets.pop(pl_b_index)
-                    break
-
-            for bt_b_index in range(len(self.bot_bullets)):
-                if self.player.hit_box.colliderect(self.bot_bullets[bt_b_index]):
-                    self.player_stunned += self.stun_time
-                    self.bot_bullets.pop(bt_b_index)
-                    break
-                self.bot_bullets[bt_b_index].x -= 5
-                if not self.max_bounds.contains(self.bot_bullets[bt_b_index]):
-                    self.bot_bullets.pop(bt_b_index)
-                    break
-
-            if self.player_reload > 0:
-                self.player_reload -= 1
-
-            if self.bot_reload > 0:
-                self.bot_reload -= 1
-
-            if self.player_stunned > 0:
-                self.player_stunned -= 1
-                self.player.image = self.pl_disabled_img
-            else:
-                self.player.image = self.pl_img
 
-            if self.bot_stunned > 0:
-                self.bot_stunned -= 1
-                self.bot.image = self.pl_disabled_img
-            else:
-                self.bot.image = self.pl_img
+    def advance(self, ticks: int = 1):
+        # scoring can pause the match for a dialogue between the ticks of one update
+        if self.dialogue.is_paused():
+            return
+        super(Tutorial, self).advance(ticks)
+        # bullets move a whole speed per tick, so they keep stepping tick by tick
+        for _ in range(ticks):
+            player_hits, bot_hits = self.bullets.update((self.player.hit_box, self.bot.hit_box), self.max_bounds)
+            self.player_stunned += self.stun_time * int(player_hits)
+            self.bot_stunned += self.stun_time * int(bot_hits)
+
+        if self.player_reload > 0:
+            self.player_reload = max(0, self.player_reload - ticks)
+
+        if self.bot_reload > 0:
+            self.bot_reload = max(0, self.bot_reload - ticks)
+
+        if self.player_stunned > 0:
+            self.player_stunned = max(0, self.player_stunned - ticks)
+            self.player.image = self.pl_disabled_img
+        else:
+            self.player.image = self.pl_img
+
+        if self.bot_stunned > 0:
+            self.bot_stunned = max(0, self.bot_stunned - ticks)
+            self.bot.image = self.pl_disabled_img
+        else:
+            self.bot.image = self.pl_img
 
     def draw(self):
         if self.dialogue.is_paused():
+            self.full_redraw = True
+            self.dirty_rects = None
             if self.escape_message:
                 self.screen.fill((rd.randint(0, 255), rd.randint(0, 255), rd.randint(0, 255)))
             self.dialogue.dialogue_rect = self.render_text(
                 surface=self.screen,
                 text=self.dialogue.get_text(),
                 pos=(0, 0),
-                right_offset=6, down_offset=2,
-                font=self.font,
-                calculate_offset=True,
-                space_offset=40
+                style=self.dialogue_style,
+                font=self.font
             )
             return self.screen
         else:
-            ret = super(Tutorial, self).draw()
-            for pl_bullet in self.player_bullets:
-                pg.draw.rect(ret, (255, 0, 0), pl_bullet)
-            for bt_bullet in self.bot_bullets:
-                pg.draw.rect(ret, (255, 0, 0), bt_bullet)
-            return ret
+            return super(Tutorial, self).draw()
 
-    # noinspection PyCallingNonCallable
-    def handle_input(self, k_id: int):
+    def draw_overlay(self, surface: pg.Surface) -> List[pg.Rect]:
+        bullets = self.bullets.rects()
+        for bullet in bullets:
+            surface.fill((255, 0, 0), bullet)
+        return bullets
+
+    def handle_action(self, action: str):
         if not self.dialogue.is_paused():
             if self.dialogue.stage == "3.3":
                 if self.player_stunned == 0:
-                    super(Tutorial, self).handle_input(k_id)
+                    super(Tutorial, self).handle_action(action)
             else:
-                super(Tutorial, self).handle_input(k_id)
+                super(Tutorial, self).handle_action(action)
         else:
             pass
 
@@ -0,0 +1,104 @@
+from typing import BinaryIO, Dict, Optional, Type, Union
+import argparse
+import os
+import time
+
+import pygame as pg
+
+from pong_game import Game, Tutorial
+from simulation import HeadlessApp
+from assets.source.input_log import InputLogReader, TICK, ACTION, KEY_EVENT, MOUSE_EVENT, MOUSE_PRESS, INITIALIZE
+
+SCENES: Dict[str, Type[Game]] = {"Game": Game, "Tutorial": Tutorial}
+
+
+class ReplayDesync(RuntimeError):
+    pass
+
+
+class ReplayApp(HeadlessApp):
+    """
+    stand-in for App while replaying, scenes get a display surface so fonts can be generated
+
+    Switches to the menu made by the replayed scene are ignored, nothing was recorded until it was entered again.
+    """
+    menu = None
+
+    def __init__(self):
+        self._scene: Optional[Game] = None
+        super(ReplayApp, self).__init__()
+        if not pg.display.get_init():
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            pg.display.init()
+        if pg.display.get_surface() is None:
+            pg.display.set_mode((1, 1))
+
+    @property
+    def scene(self) -> Optional[Game]:
+        return self._scene
+
+    @scene.setter
+    def scene(self, value: Optional[Game]):
+        if value is not None:
+            self._scene = value
+
+
+class Replayer:
+    """
+    feeds an input log recorded by App back into a fresh scene built from the recorded seed, as fast as it goes
+
+    .. code-block:: python3
+
+        replayer = Replayer("match.pongrec")
+        replayer.run(verify=True)  # raises ReplayDesync on the first tick whose state differs from the recording
+    """
+
+    def __init__(self, source: Union[str, bytes, BinaryIO]):
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                source = file.read()
+        self.log = InputLogReader(source)
+        self.app = ReplayApp()
+        self.scene = SCENES[self.log.scene](self.app, self.log.seed)
+        self.app.scene = self.scene
+        self.scene.screen = self.app.get_scene_screen()
+        self.tick = 0
+
+    def run(self, verify: bool = False) -> int:
+        scene = self.scene
+        for opcode, payload in self.log:
+            if opcode == TICK:
+                scene.update()
+                if verify and scene.checksum() != payload[0]:
+                    raise ReplayDesync(f"state differs from the recording at tick {self.tick}")
+                self.tick += 1
+            elif opcode == ACTION:
+                scene.handle_action(payload[0])
+            elif opcode == KEY_EVENT:
+                scene.handle_event(pg.event.Event(payload[0], key=payload[1]))
+            elif opcode == MOUSE_EVENT:
+                scene.handle_event(pg.event.Event(payload[0], button=payload[1], pos=payload[2:]))
+            elif opcode == MOUSE_PRESS:
+                scene.handle_mouse_press(payload[0], payload[1:])
+            elif opcode == INITIALIZE:
+                scene.initialize()
+        return self.tick
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay a recorded match at max speed")
+    parser.add_argument("log", help="input log written by main.py --record")
+    parser.add_argument("--verify", action="store_true", help="compare state checksums with the recording")
+    args = parser.parse_args()
+
+    replayer = Replayer(args.log)
+    start = time.perf_counter()
+    ticks = replayer.run(args.verify)
+    elapsed = time.perf_counter() - start
+    print(f"{replayer.log.scene} seed {replayer.log.seed}: {ticks} ticks in {elapsed:.3f}s "
+          f"({ticks / elapsed if elapsed else 0:.0f} ticks/sec), score {replayer.scene.player_score}:"
+          f"{replayer.scene.bot_score}")
+
+
+if __name__ == '__main__':
+    main()
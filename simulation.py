@@ -0,0 +1,84 @@
+from typing import Callable, Optional, Tuple, Type, Union
+import pygame as pg
+
+from pong_game import Game
+
+NONE = 0
+UP = 1
+DOWN = 2
+
+Inputs = Union[int, Tuple[int, int]]
+
+
+class HeadlessApp:
+    """
+    stand-in for App when scenes run without a display
+    """
+
+    def __init__(self):
+        self.scene: Optional[Game] = None
+        self.done = False
+
+    def get_scene_screen(self):
+        return pg.Surface(self.scene.settings["size"])
+
+    def update_screen(self):
+        pass
+
+    def get_mouse_pos(self):
+        return 0, 0
+
+
+class Simulation:
+    """
+    fixed-tick match simulation built from Game.update, without frame cap, drawing or SDL display
+
+    .. code-block:: python3
+
+        sim = Simulation()
+        sim.step(UP)            # player moves up, built-in bot plays
+        sim.step((DOWN, UP))    # player and bot both driven from outside
+
+    ``swept`` switches the ball to continuous wall, paddle and goal collision. Every step simulates ``time_scale``
+    ticks of the whole match, inputs apply at the first of them. The discrete ball steps through them one by one, so
+    a step at time_scale N plays out exactly like N steps at 1, the swept one covers them in a single sweep, the
+    same up to rounding (``benchmark.py scale`` checks both).
+    ``seed`` fixes the ball's serves, ``bot_level`` overrides the built-in bot's InterceptBot level, None for the
+    ball chasing bot.
+    """
+
+    def __init__(self, scene: Type[Game] = Game, external_bot: bool = False, swept: bool = False,
+                 time_scale: float = 1, seed: Optional[int] = None, bot_level: Optional[str] = ...):
+        self.app = HeadlessApp()
+        self.game = scene(self.app, seed)
+        if bot_level is not ...:
+            self.game.set_bot_level(bot_level)
+        self.app.scene = self.game
+        self.game.screen = self.app.get_scene_screen()
+        self.game.auto_bot = not external_bot
+        self.game.time_scale = time_scale
+        if swept:
+            self.game.swept_collision = True
+            self.game.respawn_ball()
+        self.tick = 0
+
+    @property
+    def score(self) -> Tuple[int, int]:
+        return self.game.player_score, self.game.bot_score
+
+    def step(self, inputs: Inputs = NONE):
+        if isinstance(inputs, tuple):
+            player_mode, bot_mode = inputs
+            if bot_mode:
+                self.game.bot.control(bot_mode)
+        else:
+            player_mode = inputs
+        if player_mode:
+            self.game.player.control(player_mode)
+        self.game.update()
+        self.tick += 1
+
+    def run(self, ticks: int, policy: Optional[Callable[["Simulation"], Inputs]] = None):
+        for _ in range(ticks):
+            self.step(policy(self) if policy else NONE)
+        return self.score
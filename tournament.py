@@ -0,0 +1,232 @@
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+import argparse
+import math
+import multiprocessing
+import random as rd
+import statistics
+import time
+
+import pygame as pg
+
+from pong_game import App, Player
+from simulation import Simulation
+from assets.source.intercept_bot import InterceptBot, LEVELS
+
+
+class Side(NamedTuple):
+    """
+    strategy and Player tuning of one paddle, strategy is "chase" or an InterceptBot level
+    """
+    strategy: str = "normal"
+    control_delay: int = 10
+    force: float = 10
+    friction: float = Player.friction
+
+
+class MatchSpec(NamedTuple):
+    name: str
+    seed: int
+    ticks: int
+    left: Side
+    right: Side
+
+
+class MatchResult(NamedTuple):
+    name: str
+    seed: int
+    left_score: int
+    right_score: int
+    ticks: int
+    # ticks from serve to goal, and paddle hits, of every finished rally
+    rallies: Tuple[int, ...]
+    hits: Tuple[int, ...]
+
+
+# parameter sets for the right paddle, the tutorial ones are what TutorialDialogue.check_stage switches the bot to
+PRESETS: Dict[str, Side] = {
+    "chase": Side("chase"),
+    "easy": Side("easy"),
+    "normal": Side("normal"),
+    "hard": Side("hard"),
+    "tutorial chase": Side("chase", control_delay=2, force=5),
+    "tutorial normal": Side("normal", control_delay=2, force=5),
+}
+
+
+def tune(pad: Player, side: Side):
+    pad.control_delay = side.control_delay
+    pad.up_force = pg.Vector2(y=-side.force)
+    pad.down_force = pg.Vector2(y=side.force)
+    pad.friction = side.friction
+
+
+def controller(side: Side, seed: int) -> Callable[[Player, object], int]:
+    if side.strategy == "chase":
+        def chase(pad: Player, ball) -> int:
+            if pad.hit_box.centery > ball.hit_box.centery:
+                return 1
+            if pad.hit_box.centery < ball.hit_box.centery:
+                return 2
+            return 0
+        return chase
+    return InterceptBot(side.strategy, rd.Random(seed)).control
+
+
+def play_match(spec: MatchSpec) -> MatchResult:
+    """
+    one headless match between two controlled paddles, run in a worker process
+    """
+    sim = Simulation(seed=spec.seed, external_bot=True)
+    game = sim.game
+    tune(game.player, spec.left)
+    tune(game.bot, spec.right)
+    left, right = controller(spec.left, spec.seed ^ 1), controller(spec.right, spec.seed ^ 2)
+    rallies: List[int] = []
+    hits: List[int] = []
+    rally_start, rally_hits, score = 0, 0, 0
+    for tick in range(spec.ticks):
+        was_bouncing = game.ball.body.pads_bounce_elapse
+        sim.step((left(game.player, game.ball), right(game.bot, game.ball)))
+        if not was_bouncing and game.ball.body.pads_bounce_elapse:
+            rally_hits += 1
+        if game.player_score + game.bot_score != score:
+            score = game.player_score + game.bot_score
+            rallies.append(tick + 1 - rally_start)
+            hits.append(rally_hits)
+            rally_start, rally_hits = tick + 1, 0
+    return MatchResult(spec.name, spec.seed, game.player_score, game.bot_score, spec.ticks, tuple(rallies),
+                       tuple(hits))
+
+
+def run_tournament(specs: Iterable[MatchSpec], processes: Optional[int] = None) -> Iterator[MatchResult]:
+    """
+    plays every spec across a process pool, yielding results as matches finish
+    """
+    specs = list(specs)
+    if processes == 1:
+        yield from map(play_match, specs)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(play_match, specs)
+
+
+def mean_interval(values: List[float]) -> Tuple[float, float]:
+    """
+    mean and the half width of its 95% normal confidence interval
+    """
+    if not values:
+        return math.nan, math.nan
+    if len(values) < 2:
+        return values[0], math.inf
+    return statistics.fmean(values), 1.96 * statistics.stdev(values) / math.sqrt(len(values))
+
+
+class Standings:
+    """
+    per parameter set aggregates of streamed match results
+    """
+
+    def __init__(self):
+        self.results: Dict[str, List[MatchResult]] = {}
+
+    def add(self, result: MatchResult):
+        self.results.setdefault(result.name, []).append(result)
+
+    def summary(self, name: str) -> Dict[str, Tuple[float, float]]:
+        results = self.results[name]
+        minutes = [result.ticks / App.tick_rate / 60 for result in results]
+        return {
+            "right share": mean_interval([result.right_score / max(1, result.left_score + result.right_score)
+                                          for result in results]),
+            "goals/min": mean_interval([(result.left_score + result.right_score) / minute
+                                        for result, minute in zip(results, minutes)]),
+            "rally ticks": mean_interval([statistics.fmean(result.rallies) for result in results if result.rallies]),
+            "rally hits": mean_interval([statistics.fmean(result.hits) for result in results if result.hits]),
+        }
+
+    def format(self) -> str:
+        lines = []
+        for name in sorted(self.results):
+            stats = "  ".join(f"{key} {mean:.3f}±{half:.3f}" for key, (mean, half) in self.summary(name).items())
+            lines.append(f"{name:<16} {len(self.results[name]):4d} matches  {stats}")
+        return "\n".join(lines)
+
+
+def check_levels(matches: int = 8, ticks: int = 20000, processes: Optional[int] = None) -> Dict[str, int]:
+    """
+    goals every InterceptBot level lets in against the chase bot, raises ValueError unless they strictly
+    decrease from the easiest level to the hardest
+    """
+    specs = [MatchSpec(level, seed, ticks, Side("chase"), Side(level)) for level in LEVELS for seed in range(matches)]
+    conceded = dict.fromkeys(LEVELS, 0)
+    for result in run_tournament(specs, processes):
+        conceded[result.name] += result.left_score
+    ordered = sorted(LEVELS, key=lambda level: (LEVELS[level][0], LEVELS[level][1]), reverse=True)
+    counts = [conceded[level] for level in ordered]
+    if any(easier <= harder for easier, harder in zip(counts, counts[1:])):
+        raise ValueError("levels out of order, goals let in: " +
+                         ", ".join(f"{level} {conceded[level]}" for level in ordered))
+    return conceded
+
+
+def parse_side(text: str) -> Side:
+    """
+    "strategy=normal,force=5,control_delay=2" on top of Side's defaults
+    """
+    fields = {}
+    for item in filter(None, text.split(",")):
+        key, value = item.split("=")
+        kind = Side.__annotations__[key]
+        fields[key] = value if kind is str else kind(value)
+    side = Side(**fields)
+    if side.strategy != "chase" and side.strategy not in LEVELS:
+        raise ValueError(f"unknown strategy {side.strategy}")
+    return side
+
+
+def main():
+    parser = argparse.ArgumentParser(description="headless bot and Player tuning tournament")
+    parser.add_argument("-n", "--matches", type=int, default=32, help="matches per parameter set")
+    parser.add_argument("-t", "--ticks", type=int, default=App.tick_rate * 60 * 5)
+    parser.add_argument("-p", "--processes", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--opponent", type=parse_side, default=Side("chase"), help="left paddle, as --set")
+    parser.add_argument("--set", dest="sets", action="append", default=[], metavar="NAME:KEY=VALUE,...",
+                        help="right paddle parameter set, repeatable, presets when none are given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every match as it finishes")
+    parser.add_argument("--check-levels", action="store_true",
+                        help="fail unless bot levels let in strictly fewer goals from easy to hard")
+    args = parser.parse_args()
+
+    if args.check_levels:
+        try:
+            conceded = check_levels(args.matches, args.ticks, args.processes)
+        except ValueError as error:
+            raise SystemExit(str(error))
+        print("levels in order, goals let in: " + ", ".join(f"{level} {count}" for level, count in conceded.items()))
+        return
+
+    sets = dict(PRESETS)
+    if args.sets:
+        sets = {}
+        for item in args.sets:
+            name, _, text = item.partition(":")
+            sets[name] = parse_side(text)
+    specs = [MatchSpec(name, args.seed + index, args.ticks, args.opponent, side)
+             for name, side in sets.items() for index in range(args.matches)]
+
+    standings = Standings()
+    start = time.perf_counter()
+    for result in run_tournament(specs, args.processes):
+        standings.add(result)
+        if args.verbose:
+            print(f"{result.name} seed {result.seed}: {result.left_score}:{result.right_score}, "
+                  f"{len(result.rallies)} rallies")
+    elapsed = time.perf_counter() - start
+    print(standings.format())
+    ticks = len(specs) * args.ticks
+    print(f"{len(specs)} matches, {ticks:,} ticks in {elapsed:.1f}s -> {ticks / elapsed:,.0f} ticks/sec")
+
+
+if __name__ == '__main__':
+    main()